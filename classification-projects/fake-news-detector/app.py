@@ -1,5 +1,7 @@
 import streamlit as st
 from src.pipeline.predict_pipeline import Predictor
+from src.pipeline.prediction_cache import PredictionCache, artifact_fingerprint
+from src.components.drift_monitor import DriftMonitor
 from src.logger import get_logger
 from pathlib import Path
 
@@ -10,17 +12,38 @@ st.set_page_config(page_title="Fake News Detector", layout="wide")
 st.title("Fake News Detector")
 st.caption("Paste a news headline or article text below to check if it's likely Fake or Real.")
 
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def get_model_path():
+    # Prefer the compact inference artifact; fall back to the pickled pipeline
+    artifact_dir = BASE_DIR / "artifacts" / "inference"
+    if (artifact_dir / "meta.json").exists():
+        return artifact_dir
+    return BASE_DIR / "artifacts" / "fake_news_pipeline.pkl"
+
+
 @st.cache_resource
-def load_model():
+def load_model(model_path, fingerprint):
+    # fingerprint is part of the cache key so a retrained artifact is reloaded
     try:
-        BASE_DIR = Path(__file__).resolve().parent
-        model_path = BASE_DIR / "artifacts" / "fake_news_pipeline.pkl"
-        return Predictor(model_path)
+        baseline_path = BASE_DIR / "artifacts" / "drift_baseline.json"
+        monitor = DriftMonitor.from_baseline_file(baseline_path) if baseline_path.exists() else None
+        return Predictor(model_path, monitor=monitor)
     except Exception as e:
         logger.error(e)
         return None
 
-predictor = load_model()
+
+@st.cache_resource
+def load_prediction_cache(model_path):
+    # Shared across sessions; cleared automatically when the artifact changes
+    return PredictionCache(model_path, explain_top_n=10)
+
+
+model_path = get_model_path()
+predictor = load_model(model_path, artifact_fingerprint(model_path))
+prediction_cache = load_prediction_cache(model_path)
 
 
 user_input = st.text_area(
@@ -56,9 +79,7 @@ if predict:
         st.error("Model not loaded.")
     else:
         try:
-            text = [user_input]
-            prediction = predictor.predict(text)[0]
-            probability = predictor.predict_proba(text)[0]
+            prediction, probability, top_terms = prediction_cache.predict(predictor, user_input)[0]
 
             label = "Real" if prediction == 1 else "Fake"
             prob_real = probability[1]
@@ -71,6 +92,19 @@ if predict:
             c1.metric("Probability (Real)", f"{prob_real:.2%}")
             c2.metric("Probability (Fake)", f"{prob_fake:.2%}")
 
+            if top_terms:
+                st.subheader("Top Contributing Terms")
+                st.table([
+                    {
+                        "Term": t["term"],
+                        "Contribution": f"{t['contribution']:+.4f}",
+                        "Pushes Towards": "Real" if t["contribution"] > 0 else "Fake",
+                    }
+                    for t in top_terms
+                ])
+            else:
+                st.caption("No term contributions for this prediction (they require a linear model).")
+
         except Exception as e:
             st.error("Prediction failed.")
             logger.error(e)
@@ -1,23 +1,75 @@
 import pandas as pd
 import json
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from src.logger import get_logger
+from src.logger import get_logger, log_stage
 from src.exception import CustomException
 from src.components.news_scraper import ReutersScraper, BBCScraper, scrape_bulk
 
 logger = get_logger(__name__)
 
+# Unified output schema; text columns stay object, low-cardinality ones are categorical
+OUTPUT_DTYPES = {
+    "title": "object",
+    "text": "object",
+    "source": "category",
+    "date": "object",
+    "dataset": "category",
+    "label": "int8",
+}
+
+# RSS feeds for the scraped (always real) articles: (feed url, source, dataset)
+SCRAPE_FEEDS = [
+    ("https://www.reuters.com/rssFeed/worldNews", "Reuters", "Scraped-Reuters"),
+    ("http://feeds.bbci.co.uk/news/world/rss.xml", "BBC", "Scraped-BBC"),
+]
+
+
+def to_output_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Projects a source DataFrame onto the output columns with explicit dtypes
+    """
+    return df[list(OUTPUT_DTYPES)].astype(OUTPUT_DTYPES)
+
+
+def _run_in_worker(ingestion, name, loader_name):
+    """
+    Process-pool entry point. CustomException cannot be rebuilt outside an
+    except block, so errors are sent back as plain RuntimeErrors.
+    """
+    try:
+        return ingestion._load_source(name, getattr(ingestion, loader_name))
+    except Exception as e:
+        raise RuntimeError(str(e)) from None
+
 
 class DataIngestion:
     def __init__(
         self,
         raw_data_dir="data/raw",
         processed_data_dir="data/processed",
-        output_file="fake_news_full.csv"
+        output_file="fake_news_full.csv",
+        n_workers=3,
+        optional_sources=("Scraped",),
+        articles_per_feed=10,
+        scrape_timeout=30,
+        scrape_concurrency=8
     ):
+        """
+        n_workers: processes used to parse the CSV datasets concurrently
+        optional_sources: sources whose failure is logged and skipped instead of aborting ingestion
+        scrape_timeout: seconds allowed per feed/article download before it is skipped
+        """
         self.raw_data_dir = Path(raw_data_dir)
         self.processed_data_dir = Path(processed_data_dir)
         self.output_path = self.processed_data_dir / output_file
+        self.n_workers = n_workers
+        self.optional_sources = set(optional_sources)
+        self.articles_per_feed = articles_per_feed
+        self.scrape_timeout = scrape_timeout
+        self.scrape_concurrency = scrape_concurrency
 
 
     # LIAR DATASET
@@ -34,26 +86,30 @@ class DataIngestion:
 
             dfs = []
             liar_path = self.raw_data_dir / "liar"
+            real_labels = ["true", "mostly-true"]
 
             for split in ["train.tsv", "valid.tsv", "test.tsv"]:
-                df = pd.read_csv(liar_path / split, sep="\t", header=None, names=cols)
-
-                df["label"] = df["label"].apply(
-                    lambda x: 1 if x in ["true", "mostly-true"] else 0
+                df = pd.read_csv(
+                    liar_path / split, sep="\t", header=None, names=cols,
+                    usecols=["label", "statement", "speaker"],
+                    dtype={"label": "category", "statement": "object", "speaker": "object"}
                 )
 
+                # Vectorized label mapping on the categorical column
+                df["label"] = df["label"].isin(real_labels).astype("int8")
+
                 dfs.append(df)
 
             liar = pd.concat(dfs, ignore_index=True)
 
-            return pd.DataFrame({
+            return to_output_schema(pd.DataFrame({
                 "title": None,
                 "text": liar["statement"],
                 "source": liar["speaker"],
                 "date": None,
                 "dataset": "LIAR",
                 "label": liar["label"]
-            })
+            }))
 
         except Exception as e:
             raise CustomException(e)
@@ -64,22 +120,23 @@ class DataIngestion:
             logger.info("Loading ISOT dataset")
 
             isot_path = self.raw_data_dir / "isot"
-            fake = pd.read_csv(isot_path / "Fake.csv")
-            true = pd.read_csv(isot_path / "True.csv")
+            usecols = lambda c: c in ("title", "text", "date")
+            fake = pd.read_csv(isot_path / "Fake.csv", usecols=usecols, dtype="object")
+            true = pd.read_csv(isot_path / "True.csv", usecols=usecols, dtype="object")
 
             fake["label"] = 0
             true["label"] = 1
 
             isot = pd.concat([fake, true], ignore_index=True)
 
-            return pd.DataFrame({
+            return to_output_schema(pd.DataFrame({
                 "title": isot["title"],
                 "text": isot["text"],
                 "source": None,
                 "date": isot.get("date"),
                 "dataset": "ISOT",
                 "label": isot["label"]
-            })
+            }))
 
         except Exception as e:
             raise CustomException(e)
@@ -105,97 +162,162 @@ class DataIngestion:
                 if not file_path.exists():
                     raise FileNotFoundError(f"Missing file: {file_path}")
 
-                df = pd.read_csv(file_path)
+                df = pd.read_csv(
+                    file_path,
+                    usecols=lambda c: c in ("title", "news_url"),
+                    dtype="object"
+                )
 
-                out_df = pd.DataFrame({
+                out_df = to_output_schema(pd.DataFrame({
                     "title": df["title"],
                     "text": df["title"],          # headline-only
                     "source": df.get("news_url"),
                     "date": None,
                     "dataset": dataset_name,
                     "label": label
-                })
+                }))
 
                 dfs.append(out_df)
 
-            return pd.concat(dfs, ignore_index=True)
+            return to_output_schema(pd.concat(dfs, ignore_index=True))
 
         except Exception as e:
             raise CustomException(e)
 
 
     # SCRAPED NEWS DATA
-    def _load_scraped_news(self):
-        import feedparser
+    @staticmethod
+    def _fetch_article(url, source, dataset):
         from newspaper import Article
-        import pandas as pd
-        from datetime import datetime
-
-        records = []
-
-        # ===== Reuters RSS =====
-        reuters_feed = "https://www.reuters.com/rssFeed/worldNews"
-        feed = feedparser.parse(reuters_feed)
-
-        for entry in feed.entries[:10]:  # first 10 articles
-            url = entry.link
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-
-                records.append({
-                    "title": article.title,
-                    "text": article.text,
-                    "source": "Reuters",
-                    "date": datetime.now(),
-                    "dataset": "Scraped-Reuters",
-                    "label": 1
-                })
-            except Exception as e:
-                print(f"Skipping {url}: {e}")
-
-        # ===== BBC RSS =====
-        bbc_feed = "http://feeds.bbci.co.uk/news/world/rss.xml"
-        feed = feedparser.parse(bbc_feed)
-
-        for entry in feed.entries[:10]:
-            url = entry.link
-            try:
-                article = Article(url)
-                article.download()
-                article.parse()
-
-                records.append({
-                    "title": article.title,
-                    "text": article.text,
-                    "source": "BBC",
-                    "date": datetime.now(),
-                    "dataset": "Scraped-BBC",
-                    "label": 1
-                })
-            except Exception as e:
-                print(f"Skipping {url}: {e}")
-
-        return pd.DataFrame(records)
 
+        article = Article(url)
+        article.download()
+        article.parse()
+
+        return {
+            "title": article.title,
+            "text": article.text,
+            "source": source,
+            "date": datetime.now(),
+            "dataset": dataset,
+            "label": 1
+        }
+
+    async def _scrape_feed(self, loop, executor, semaphore, feed_url, source, dataset):
+        """
+        Downloads the first articles of one RSS feed concurrently; a slow or
+        failing feed/article is skipped after scrape_timeout seconds
+        """
+        import feedparser
+
+        try:
+            feed = await asyncio.wait_for(
+                loop.run_in_executor(executor, feedparser.parse, feed_url), self.scrape_timeout
+            )
+        except Exception as e:
+            logger.warning(f"Skipping feed {feed_url}: {e!r}")
+            return []
+
+        async def fetch(url):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(executor, self._fetch_article, url, source, dataset),
+                        self.scrape_timeout
+                    )
+                except Exception as e:
+                    logger.warning(f"Skipping {url}: {e!r}")
+                    return None
+
+        records = await asyncio.gather(*(fetch(entry.link) for entry in feed.entries[:self.articles_per_feed]))
+        return [record for record in records if record is not None]
+
+    async def _scrape_all(self):
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.scrape_concurrency)
+        # Own executor so timed-out downloads are abandoned instead of awaited on shutdown
+        executor = ThreadPoolExecutor(max_workers=self.scrape_concurrency)
+        try:
+            feeds = await asyncio.gather(*(
+                self._scrape_feed(loop, executor, semaphore, *feed) for feed in SCRAPE_FEEDS
+            ))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return [record for records in feeds for record in records]
+
+    def _load_scraped_news(self):
+        logger.info("Scraping news feeds")
+        records = asyncio.run(self._scrape_all())
+        return to_output_schema(pd.DataFrame(records, columns=list(OUTPUT_DTYPES)))
+
+
+    def _load_source(self, name, loader) -> pd.DataFrame:
+        """
+        Runs a source loader inside a timed stage (duration, peak traced memory, rows).
+        CSV loaders each run in their own worker process, so tracing one does not
+        slow down or skew another.
+        """
+        with log_stage(f"ingest_{name}", logger=logger, memory=True, source=name) as stage:
+            df = loader()
+            stage["rows"] = len(df)
+            stage["result_mb"] = round(df.memory_usage(deep=True).sum() / 1024 ** 2, 2)
+        return df
+
+
+    def _load_sources(self, include_scraped=True) -> dict:
+        """
+        Runs the source loaders concurrently: CSV datasets in a process pool while
+        the feeds are scraped asynchronously in this process. Each source is timed
+        separately and a failing one does not cancel the others.
+        Returns: {source name: DataFrame or the exception it raised}
+        """
+        csv_sources = {
+            "LIAR": "_load_liar",
+            "ISOT": "_load_isot",
+            "FakeNewsNet": "_load_fakenewsnet",
+        }
+        results = {}
+
+        with ProcessPoolExecutor(max_workers=self.n_workers) as pool:
+            futures = {
+                name: pool.submit(_run_in_worker, self, name, loader_name)
+                for name, loader_name in csv_sources.items()
+            }
+
+            if include_scraped:
+                try:
+                    results["Scraped"] = self._load_source("Scraped", self._load_scraped_news)
+                except Exception as e:
+                    results["Scraped"] = e
+
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    results[name] = e
+
+        # Keep the original source order in the combined dataset
+        return {name: results[name] for name in [*csv_sources, "Scraped"] if name in results}
 
     # MASTER INGESTION
     def initiate_data_ingestion(self, include_scraped=True) -> str:
         try:
             logger.info("Starting full data ingestion pipeline")
 
-            liar_df = self._load_liar()
-            isot_df = self._load_isot()
-            fakenewsnet_df = self._load_fakenewsnet()
+            results = self._load_sources(include_scraped)
 
-            dfs = [liar_df, isot_df, fakenewsnet_df]
+            failed = {name: result for name, result in results.items() if isinstance(result, Exception)}
+            for name, error in failed.items():
+                logger.error(f"Source '{name}' failed: {error}")
 
-            if include_scraped:
-                scraped_df = self._load_scraped_news()
-                dfs.append(scraped_df)
+            required_failed = [name for name in failed if name not in self.optional_sources]
+            if required_failed:
+                raise RuntimeError(f"Required sources failed: {', '.join(required_failed)}")
 
-            df = pd.concat(dfs, ignore_index=True)
+            dfs = [df for df in results.values() if not isinstance(df, Exception)]
+
+            # Categories differ per source, so concat falls back to object; restore the schema
+            df = to_output_schema(pd.concat(dfs, ignore_index=True))
 
             df = df.dropna(subset=["text"])
             df["text"] = df["text"].astype(str)
@@ -212,4 +334,4 @@ class DataIngestion:
 
         except Exception as e:
             logger.error("Data ingestion failed")
-            raise CustomException(e)
\ No newline at end of file
+            raise CustomException(e)
@@ -1,14 +1,18 @@
 from imblearn.pipeline import Pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.svm import LinearSVC
+from sklearn.naive_bayes import ComplementNB
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, f1_score
 import pandas as pd
 import re
 
-from src.logger import get_logger
+from src.logger import get_logger, log_stage
 from src.exception import CustomException
-from src.utils import save_object
+from src.utils import save_object, file_sha256
+from src.components.feature_cache import FeatureCache
 
 logger = get_logger(__name__)
 
@@ -24,39 +28,80 @@ def clean_text(text: str) -> str:
     return text
 
 
+# Supported classifiers: (estimator class, default params)
+CLASSIFIERS = {
+    "logistic": (LogisticRegression, {"max_iter": 1000, "class_weight": "balanced", "n_jobs": -1}),
+    "linear_svm": (LinearSVC, {"class_weight": "balanced", "dual": "auto"}),
+    "complement_nb": (ComplementNB, {}),
+    "sgd": (SGDClassifier, {"loss": "log_loss", "class_weight": "balanced", "random_state": 42}),
+}
+
+
+def build_vectorizer() -> TfidfVectorizer:
+    """
+    TF-IDF vectorizer shared by training and model selection
+    """
+    return TfidfVectorizer(max_features=50000, ngram_range=(1,2), stop_words="english")
+
+
+def build_classifier(model_type="logistic", params=None, probability=False):
+    """
+    Builds a classifier from CLASSIFIERS with params overriding the defaults.
+    With probability=True, models without predict_proba (linear SVM) are calibrated
+    """
+    if model_type not in CLASSIFIERS:
+        raise ValueError(f"Unsupported model_type '{model_type}'. Choose from {list(CLASSIFIERS)}")
+
+    estimator_cls, defaults = CLASSIFIERS[model_type]
+    model = estimator_cls(**{**defaults, **(params or {})})
+
+    if probability and not hasattr(model, "predict_proba"):
+        model = CalibratedClassifierCV(model, cv=3)
+    return model
+
+
 class DataTransformation:
-    def __init__(self, model_type="logistic"):
+    def __init__(self, model_type="logistic", model_params=None, use_cache=True,
+                 cache_dir="artifacts/feature_cache"):
         """
         Initialize the pipeline
         """
         self.model_type = model_type
-        if self.model_type == "logistic":
-            self.model = LogisticRegression(
-                max_iter=1000,
-                class_weight="balanced",
-                n_jobs=-1
-            )
-        else:
-            raise ValueError("Currently only logistic regression is supported")
+        self.model = build_classifier(model_type, model_params, probability=True)
+
+        self.vectorizer = build_vectorizer()
+        self.cache = FeatureCache(cache_dir) if use_cache else None
 
         self.pipeline = Pipeline(
             steps=[
-                ("tfidf", TfidfVectorizer(max_features=50000, ngram_range=(1,2), stop_words="english")),
+                ("tfidf", self.vectorizer),
                 ("classifier", self.model)
             ]
         )
 
-    def initiate_data_transformation(self, csv_path: str, test_size=0.2, random_state=42):
+    def get_features(self, csv_path: str, test_size=0.2, random_state=42) -> dict:
         """
-        Reads CSV, splits train/test, fits pipeline on training data
-        Returns fitted pipeline and test split
+        Returns the fitted vectorizer and train/test sparse matrices for a dataset,
+        loading them from the feature cache when the dataset and params are unchanged
         """
         try:
-            logger.info("Starting data transformation")
+            key = FeatureCache.make_key(
+                file_sha256(csv_path),
+                self.vectorizer.get_params(),
+                test_size,
+                random_state
+            )
+
+            if self.cache is not None and self.cache.exists(key):
+                features = self.cache.load(key)
+                self.vectorizer = features["vectorizer"]
+                return features
 
-            df = pd.read_csv(csv_path)
-            df = df.dropna(subset=["text"])
-            df["text"] = df["text"].apply(clean_text)
+            with log_stage("read_and_clean", logger=logger) as stage:
+                df = pd.read_csv(csv_path, usecols=["text", "label"], dtype={"text": "object", "label": "int8"})
+                df = df.dropna(subset=["text"])
+                df["text"] = df["text"].apply(clean_text)
+                stage["rows"] = len(df)
 
             X = df["text"]
             y = df["label"]
@@ -68,12 +113,57 @@ class DataTransformation:
                 random_state=random_state
             )
 
-            # Fit pipeline on training data
-            logger.info("Fitting pipeline (TF-IDF + Logistic Regression)")
-            self.pipeline.fit(X_train, y_train)
+            logger.info("Fitting TF-IDF vectorizer")
+            with log_stage("tfidf_fit", logger=logger) as stage:
+                features = {
+                    "vectorizer": self.vectorizer,
+                    "X_train": self.vectorizer.fit_transform(X_train),
+                    "X_test": self.vectorizer.transform(X_test),
+                    "y_train": y_train.to_numpy(),
+                    "y_test": y_test.to_numpy(),
+                    "test_texts": X_test,
+                }
+                stage["rows"] = len(X_train)
+
+            if self.cache is not None:
+                self.cache.save(
+                    key,
+                    meta={"csv_path": csv_path, "test_size": test_size, "random_state": random_state},
+                    **features
+                )
+
+            return features
+
+        except Exception as e:
+            logger.error("Error building TF-IDF features")
+            raise CustomException(e)
+
+    def initiate_data_transformation(self, csv_path: str, test_size=0.2, random_state=42):
+        """
+        Builds (or loads cached) TF-IDF features, fits the classifier on training data
+        Returns fitted pipeline and test split
+        """
+        try:
+            logger.info("Starting data transformation")
+
+            features = self.get_features(csv_path, test_size=test_size, random_state=random_state)
+
+            # Fit classifier on the (possibly cached) training matrix
+            logger.info(f"Fitting classifier ({self.model_type}) on TF-IDF features")
+            with log_stage("classifier_fit", logger=logger, model_type=self.model_type) as stage:
+                self.model.fit(features["X_train"], features["y_train"])
+                stage["rows"] = features["X_train"].shape[0]
+
+            self.pipeline = Pipeline(
+                steps=[
+                    ("tfidf", features["vectorizer"]),
+                    ("classifier", self.model)
+                ]
+            )
 
             # Evaluate on test data
-            y_pred = self.pipeline.predict(X_test)
+            y_test = features["y_test"]
+            y_pred = self.model.predict(features["X_test"])
             f1 = f1_score(y_test, y_pred)
             logger.info(f"F1 Score on test set: {f1:.4f}")
             logger.info("\n" + classification_report(y_test, y_pred))
@@ -81,7 +171,7 @@ class DataTransformation:
             # Save the full pipeline
             # save_object("artifacts/fake_news_pipeline.pkl", self.pipeline)
 
-            return self.pipeline, X_test, y_test
+            return self.pipeline, features["test_texts"], y_test
 
         except Exception as e:
             logger.error("Error during data transformation pipeline")
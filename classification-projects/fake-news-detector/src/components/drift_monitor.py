@@ -0,0 +1,172 @@
+import json
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+# Fixed bin edges keep every window sketch a handful of counters
+SCORE_BINS = np.linspace(0.0, 1.0, 11)
+LENGTH_BINS = np.array([0, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, np.inf])
+
+
+def text_stats(vectorizer, texts):
+    """
+    Per-text token counts and in-vocabulary token counts for a fitted TfidfVectorizer
+    Returns: (n_tokens, n_known) integer arrays
+    """
+    analyzer = vectorizer.build_analyzer()
+    vocabulary = vectorizer.vocabulary_
+    n_tokens = np.zeros(len(texts), dtype=np.int64)
+    n_known = np.zeros(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        tokens = analyzer(text)
+        n_tokens[i] = len(tokens)
+        n_known[i] = sum(1 for t in tokens if t in vocabulary)
+    return n_tokens, n_known
+
+
+def _histogram(values, bins):
+    return np.histogram(np.clip(values, bins[0], None), bins=bins)[0].astype(np.int64)
+
+
+def population_stability_index(expected, actual, eps=1e-4):
+    """
+    PSI between two histograms of counts over the same bins
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return 0.0
+    p = np.clip(expected / expected.sum(), eps, None)
+    q = np.clip(actual / actual.sum(), eps, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def build_baseline(prob_real, n_tokens, n_known):
+    """
+    Training-time reference sketches: score and length histograms and OOV rate
+    """
+    return {
+        "score_hist": _histogram(prob_real, SCORE_BINS).tolist(),
+        "length_hist": _histogram(n_tokens, LENGTH_BINS).tolist(),
+        "oov_rate": float(1.0 - n_known.sum() / max(n_tokens.sum(), 1)),
+        "n_samples": int(len(prob_real)),
+        "created_at": datetime.now().isoformat(),
+    }
+
+
+def save_baseline(baseline, file_path="artifacts/drift_baseline.json"):
+    try:
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w") as file:
+            json.dump(baseline, file, indent=2)
+        logger.info(f"Drift baseline saved at {file_path}")
+    except Exception as e:
+        raise CustomException(e)
+
+
+class DriftMonitor:
+    """
+    Streaming drift monitor for the prediction path. Each time window keeps
+    only fixed-size sketches (score histogram, length histogram, token and
+    OOV counters); when a window closes it is compared with the training
+    baseline (PSI for histograms, absolute change for OOV rate) and the
+    report is logged and appended to report_path.
+    """
+
+    def __init__(self, baseline, window_seconds=3600, min_samples=100,
+                 psi_threshold=0.2, oov_threshold=0.1,
+                 report_path="logs/drift_reports.jsonl", history=24):
+        self.baseline = baseline
+        self.window_seconds = window_seconds
+        self.min_samples = min_samples
+        self.psi_threshold = psi_threshold
+        self.oov_threshold = oov_threshold
+        self.report_path = report_path
+        self.reports = deque(maxlen=history)
+
+        self._lock = threading.Lock()
+        self._reset_window(time.time())
+
+    @classmethod
+    def from_baseline_file(cls, file_path="artifacts/drift_baseline.json", **kwargs):
+        with open(file_path) as file:
+            return cls(json.load(file), **kwargs)
+
+    def _reset_window(self, now):
+        self.window_start = now
+        self.score_hist = np.zeros(len(SCORE_BINS) - 1, dtype=np.int64)
+        self.length_hist = np.zeros(len(LENGTH_BINS) - 1, dtype=np.int64)
+        self.n_samples = 0
+        self.n_tokens = 0
+        self.n_known = 0
+
+    def update(self, prob_real, n_tokens, n_known):
+        """
+        Adds a batch of predictions: probability of Real, token and in-vocabulary counts per text
+        """
+        now = time.time()
+        with self._lock:
+            if now - self.window_start >= self.window_seconds:
+                self._close_window(now)
+
+            self.score_hist += _histogram(np.asarray(prob_real), SCORE_BINS)
+            self.length_hist += _histogram(np.asarray(n_tokens), LENGTH_BINS)
+            self.n_samples += len(prob_real)
+            self.n_tokens += int(np.sum(n_tokens))
+            self.n_known += int(np.sum(n_known))
+
+    def _window_report(self, now):
+        oov_rate = 1.0 - self.n_known / max(self.n_tokens, 1)
+        score_psi = population_stability_index(self.baseline["score_hist"], self.score_hist)
+        length_psi = population_stability_index(self.baseline["length_hist"], self.length_hist)
+        oov_shift = oov_rate - self.baseline["oov_rate"]
+
+        return {
+            "window_start": datetime.fromtimestamp(self.window_start).isoformat(),
+            "window_end": datetime.fromtimestamp(now).isoformat(),
+            "n_samples": self.n_samples,
+            "score_psi": round(score_psi, 4),
+            "length_psi": round(length_psi, 4),
+            "oov_rate": round(oov_rate, 4),
+            "oov_shift": round(oov_shift, 4),
+            "drift": bool(
+                self.n_samples >= self.min_samples and (
+                    score_psi > self.psi_threshold
+                    or length_psi > self.psi_threshold
+                    or oov_shift > self.oov_threshold
+                )
+            ),
+        }
+
+    def _close_window(self, now):
+        if self.n_samples > 0:
+            report = self._window_report(now)
+            self.reports.append(report)
+
+            if report["drift"]:
+                logger.warning(f"Input drift detected, consider retraining: {report}")
+            else:
+                logger.info(f"Drift window closed: {report}")
+
+            if self.report_path:
+                Path(self.report_path).parent.mkdir(parents=True, exist_ok=True)
+                with open(self.report_path, "a") as file:
+                    file.write(json.dumps(report) + "\n")
+
+        self._reset_window(now)
+
+    def current_report(self) -> dict:
+        """
+        Comparison of the still-open window against the baseline
+        """
+        with self._lock:
+            return self._window_report(time.time())
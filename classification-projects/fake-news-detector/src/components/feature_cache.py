@@ -0,0 +1,92 @@
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from src.logger import get_logger
+from src.exception import CustomException
+from src.utils import save_object, load_object
+
+logger = get_logger(__name__)
+
+
+class FeatureCache:
+    """
+    Persists a fitted vectorizer and its train/test sparse matrices so that
+    classifier experiments reuse them instead of refitting TF-IDF.
+    Entries are keyed on the dataset hash plus the vectorizer/split params.
+    """
+
+    def __init__(self, cache_dir="artifacts/feature_cache"):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """
+        Stable key from any JSON-serializable parts (dataset hash, params, ...)
+        """
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _entry_dir(self, key) -> Path:
+        return self.cache_dir / key
+
+    def exists(self, key) -> bool:
+        return (self._entry_dir(key) / "meta.json").exists()
+
+    def save(self, key, vectorizer, X_train, X_test, y_train, y_test, test_texts=None, meta=None):
+        """
+        Writes the vectorizer (pickle), matrices (CSR .npz) and labels (.npy)
+        """
+        try:
+            entry_dir = self._entry_dir(key)
+            tmp_dir = entry_dir.with_name(entry_dir.name + ".tmp")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            tmp_dir.mkdir(parents=True)
+
+            save_object(str(tmp_dir / "vectorizer.pkl"), vectorizer)
+            sparse.save_npz(tmp_dir / "X_train.npz", sparse.csr_matrix(X_train))
+            sparse.save_npz(tmp_dir / "X_test.npz", sparse.csr_matrix(X_test))
+            np.save(tmp_dir / "y_train.npy", np.asarray(y_train))
+            np.save(tmp_dir / "y_test.npy", np.asarray(y_test))
+            if test_texts is not None:
+                save_object(str(tmp_dir / "test_texts.pkl"), test_texts)
+
+            # meta.json is written last and marks the entry as complete
+            with open(tmp_dir / "meta.json", "w") as file:
+                json.dump(meta or {}, file, default=str)
+
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            tmp_dir.rename(entry_dir)
+            logger.info(f"Feature matrices cached at {entry_dir}")
+
+        except Exception as e:
+            logger.error("Error saving feature cache")
+            raise CustomException(e)
+
+    def load(self, key) -> dict:
+        """
+        Returns a dict with vectorizer, X_train, X_test, y_train, y_test
+        and test_texts (None if not cached)
+        """
+        try:
+            entry_dir = self._entry_dir(key)
+            test_texts_path = entry_dir / "test_texts.pkl"
+
+            entry = {
+                "vectorizer": load_object(str(entry_dir / "vectorizer.pkl")),
+                "X_train": sparse.load_npz(entry_dir / "X_train.npz"),
+                "X_test": sparse.load_npz(entry_dir / "X_test.npz"),
+                "y_train": np.load(entry_dir / "y_train.npy"),
+                "y_test": np.load(entry_dir / "y_test.npy"),
+                "test_texts": load_object(str(test_texts_path)) if test_texts_path.exists() else None,
+            }
+            logger.info(f"Feature matrices loaded from cache {entry_dir}")
+            return entry
+
+        except Exception as e:
+            logger.error("Error loading feature cache")
+            raise CustomException(e)
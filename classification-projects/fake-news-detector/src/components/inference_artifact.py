@@ -0,0 +1,264 @@
+import json
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from scipy.special import expit
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import normalize
+
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+# Vectorizer params needed to rebuild the analyzer (tokenizer + n-grams + stop words)
+ANALYZER_PARAMS = [
+    "analyzer", "lowercase", "strip_accents", "token_pattern",
+    "stop_words", "ngram_range", "binary", "sublinear_tf", "norm", "use_idf",
+]
+
+# Decision function -> probability of the positive class, per classifier loss
+LINK_FUNCTIONS = {
+    "log_loss": expit,
+    "modified_huber": lambda decision: (np.clip(decision, -1.0, 1.0) + 1.0) / 2.0,
+}
+
+
+def export_inference_artifact(pipeline, out_dir="artifacts/inference", keep_fraction=1.0,
+                              weight_dtype="float64"):
+    """
+    Writes a compact inference artifact for a TF-IDF + linear classifier pipeline:
+    sorted vocabulary terms and their column ids, IDF and coefficient vectors as
+    .npy files (memory-mappable), and a meta.json with analyzer params.
+
+    keep_fraction < 1 prunes the lowest-|coef| features and shrinks the vocabulary
+    (rows are then L2-normalized over the kept terms only, a small approximation).
+    weight_dtype is "float64", "float32" or "int8" (coefficients scaled to
+    [-127, 127] with the scale stored in meta.json; IDF kept as float32).
+    """
+    try:
+        vectorizer = pipeline.steps[0][1]
+        classifier = pipeline.steps[-1][1]
+
+        if not isinstance(vectorizer, TfidfVectorizer) or not hasattr(vectorizer, "vocabulary_"):
+            raise ValueError("Inference artifact requires a fitted TfidfVectorizer as first step")
+        if vectorizer.analyzer != "word":
+            raise ValueError("Inference artifact requires a word-level analyzer")
+        if not isinstance(classifier, (LogisticRegression, SGDClassifier)) \
+                or not hasattr(classifier, "predict_proba") or classifier.coef_.shape[0] != 1:
+            raise ValueError("Inference artifact requires a binary logistic classifier")
+        # SGD probabilities are a sigmoid for log_loss but clipped linear for modified_huber
+        loss = classifier.loss if isinstance(classifier, SGDClassifier) else "log_loss"
+        if loss not in LINK_FUNCTIONS:
+            raise ValueError(f"Inference artifact does not support loss '{loss}'")
+
+        if weight_dtype not in ("float64", "float32", "int8"):
+            raise ValueError("weight_dtype must be 'float64', 'float32' or 'int8'")
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        coef = classifier.coef_.ravel()
+        idf = vectorizer.idf_ if vectorizer.use_idf else np.ones(len(coef))
+
+        # Prune: keep the top keep_fraction of features by |coef| and re-index them densely
+        n_keep = max(1, int(round(keep_fraction * len(coef))))
+        kept = np.sort(np.argsort(-np.abs(coef), kind="stable")[:n_keep])
+        new_index = np.full(len(coef), -1, dtype=np.int64)
+        new_index[kept] = np.arange(len(kept))
+
+        terms = np.array(sorted(t for t, col in vectorizer.vocabulary_.items() if new_index[col] >= 0))
+        columns = np.array([new_index[vectorizer.vocabulary_[t]] for t in terms], dtype=np.int32)
+        coef, idf = coef[kept], idf[kept]
+
+        coef_scale = 1.0
+        if weight_dtype == "int8":
+            coef_scale = float(np.abs(coef).max() / 127) or 1.0
+            coef = np.round(coef / coef_scale).astype(np.int8)
+            idf = idf.astype(np.float32)
+        else:
+            coef = coef.astype(weight_dtype)
+            idf = idf.astype(weight_dtype)
+
+        np.save(out_dir / "terms.npy", terms)
+        np.save(out_dir / "columns.npy", columns)
+        np.save(out_dir / "idf.npy", idf)
+        np.save(out_dir / "coef.npy", coef)
+
+        params = {name: getattr(vectorizer, name) for name in ANALYZER_PARAMS}
+        if params["stop_words"] is not None and not isinstance(params["stop_words"], str):
+            params["stop_words"] = sorted(params["stop_words"])
+
+        meta = {
+            "vectorizer": params,
+            "intercept": float(classifier.intercept_[0]),
+            "loss": loss,
+            "classes": [int(c) for c in classifier.classes_],
+            "n_features": int(len(terms)),
+            "coef_scale": coef_scale,
+            "weight_dtype": weight_dtype,
+            "keep_fraction": keep_fraction,
+        }
+        with open(out_dir / "meta.json", "w") as file:
+            json.dump(meta, file, indent=2)
+
+        logger.info(f"Inference artifact exported to {out_dir} ({len(terms)} terms)")
+        return str(out_dir)
+
+    except Exception as e:
+        logger.error("Error exporting inference artifact")
+        raise CustomException(e)
+
+
+def top_term_contributions(X, coef, feature_names, top_n=10, coef_scale=1.0):
+    """
+    Per-row n-gram attributions for a linear model, computed directly from the
+    sparse TF-IDF rows: contribution = tfidf weight * coefficient.
+    Positive contributions push towards Real, negative towards Fake.
+    Returns: one list of {"term", "contribution"} dicts per row, largest |contribution| first
+    """
+    X = sparse.csr_matrix(X)
+    explanations = []
+    for i in range(X.shape[0]):
+        start, end = X.indptr[i], X.indptr[i + 1]
+        cols = X.indices[start:end]
+        contributions = X.data[start:end] * coef[cols] * coef_scale
+
+        if len(cols) > top_n:
+            top = np.argpartition(-np.abs(contributions), top_n)[:top_n]
+        else:
+            top = np.arange(len(cols))
+        top = top[np.argsort(-np.abs(contributions[top]))]
+
+        explanations.append([
+            {"term": str(feature_names[cols[j]]), "contribution": float(contributions[j])}
+            for j in top
+        ])
+    return explanations
+
+
+class FastScorer:
+    """
+    Scores texts from an exported inference artifact without unpickling the
+    sklearn pipeline. Arrays are memory-mapped, vocabulary lookup is a single
+    np.searchsorted over the sorted terms, and label and probability come
+    from one transform.
+    """
+
+    def __init__(self, artifact_dir="artifacts/inference"):
+        try:
+            artifact_dir = Path(artifact_dir)
+            with open(artifact_dir / "meta.json") as file:
+                self.meta = json.load(file)
+
+            self.terms = np.load(artifact_dir / "terms.npy", mmap_mode="r")
+            self.columns = np.load(artifact_dir / "columns.npy", mmap_mode="r")
+            self.idf = np.load(artifact_dir / "idf.npy", mmap_mode="r")
+            self.coef = np.load(artifact_dir / "coef.npy", mmap_mode="r")
+            self.coef_scale = self.meta.get("coef_scale", 1.0)
+            self.intercept = self.meta["intercept"]
+            self.link = LINK_FUNCTIONS[self.meta.get("loss", "log_loss")]
+            self.classes = np.array(self.meta["classes"])
+
+            params = dict(self.meta["vectorizer"])
+            params["ngram_range"] = tuple(params["ngram_range"])
+            self.vectorizer_params = params
+            self.analyzer = TfidfVectorizer(**params).build_analyzer()
+            self._feature_names = None
+
+            logger.info(f"Fast scorer loaded from {artifact_dir} ({self.meta['n_features']} terms)")
+
+        except Exception as e:
+            logger.error("Failed to load inference artifact")
+            raise CustomException(e)
+
+    def transform(self, texts, return_stats=False):
+        """
+        TF-IDF transform equivalent to the exported vectorizer
+        Returns: CSR matrix (n_texts x n_features); with return_stats also
+        (n_tokens, n_known) per text, the total and in-vocabulary token counts
+        """
+        doc_ids, tokens = [], []
+        for i, text in enumerate(texts):
+            doc_tokens = self.analyzer(text)
+            tokens.extend(doc_tokens)
+            doc_ids.extend([i] * len(doc_tokens))
+
+        n_docs = len(texts)
+        n_features = self.meta["n_features"]
+        if not tokens:
+            X = sparse.csr_matrix((n_docs, n_features))
+            if return_stats:
+                return X, (np.zeros(n_docs, dtype=np.int64), np.zeros(n_docs, dtype=np.int64))
+            return X
+
+        tokens = np.array(tokens)
+        doc_ids = np.array(doc_ids, dtype=np.int32)
+
+        positions = np.searchsorted(self.terms, tokens)
+        positions[positions == len(self.terms)] = 0
+        known = self.terms[positions] == tokens
+
+        X = sparse.csr_matrix(
+            (np.ones(known.sum()), (doc_ids[known], self.columns[positions[known]])),
+            shape=(n_docs, n_features)
+        )
+        X.sum_duplicates()
+
+        if self.vectorizer_params["binary"]:
+            X.data[:] = 1.0
+        if self.vectorizer_params["sublinear_tf"]:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.vectorizer_params["use_idf"]:
+            X.data *= self.idf[X.indices]
+        if self.vectorizer_params["norm"] is not None:
+            X = normalize(X, norm=self.vectorizer_params["norm"], copy=False)
+
+        if return_stats:
+            n_tokens = np.bincount(doc_ids, minlength=n_docs)
+            n_known = np.bincount(doc_ids[known], minlength=n_docs)
+            return X, (n_tokens, n_known)
+        return X
+
+    def predict_matrix(self, X):
+        """
+        Returns: (labels, probabilities) for an already transformed matrix
+        """
+        prob_real = self.link((X @ self.coef) * self.coef_scale + self.intercept)
+        probs = np.column_stack([1.0 - prob_real, prob_real])
+        labels = self.classes[(prob_real > 0.5).astype(int)]
+        return labels, probs
+
+    def feature_names(self):
+        """
+        Terms indexed by column id, built lazily on first explanation
+        """
+        if self._feature_names is None:
+            names = np.empty(len(self.terms), dtype=self.terms.dtype)
+            names[self.columns] = self.terms
+            self._feature_names = names
+        return self._feature_names
+
+    def score(self, texts, top_n=0):
+        """
+        Returns: (labels, probabilities) with probabilities as [prob_fake, prob_real];
+        with top_n > 0 also the top contributing n-grams per text, from the same transform
+        """
+        try:
+            if isinstance(texts, str):
+                texts = [texts]
+            X = self.transform(texts)
+            labels, probs = self.predict_matrix(X)
+
+            if top_n > 0:
+                return labels, probs, top_term_contributions(
+                    X, self.coef, self.feature_names(), top_n, self.coef_scale
+                )
+            return labels, probs
+
+        except Exception as e:
+            logger.error("Fast scoring failed")
+            raise CustomException(e)
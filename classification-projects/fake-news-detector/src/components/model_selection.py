@@ -0,0 +1,224 @@
+import math
+import time
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.model_selection import StratifiedKFold
+from sklearn.metrics import accuracy_score, f1_score
+
+from src.logger import get_logger
+from src.exception import CustomException
+from src.utils import file_sha256
+from src.components.feature_cache import FeatureCache
+from src.components.data_transformation import clean_text, build_vectorizer, build_classifier
+
+logger = get_logger(__name__)
+
+
+# Regularization grids searched per model type
+PARAM_GRIDS = {
+    "logistic": {"C": [0.1, 1.0, 10.0]},
+    "linear_svm": {"C": [0.1, 1.0, 10.0]},
+    "complement_nb": {"alpha": [0.1, 0.5, 1.0]},
+    "sgd": {"alpha": [1e-6, 1e-5, 1e-4]},
+}
+
+
+def _expand_candidates(param_grids):
+    candidates = []
+    for model_type, grid in param_grids.items():
+        keys = list(grid)
+        for values in product(*(grid[k] for k in keys)):
+            candidates.append((model_type, dict(zip(keys, values))))
+    return candidates
+
+
+def _evaluate_candidate(candidate_id, model_type, params, fold, X_train, y_train, X_val, y_val, n_resources, seed):
+    """
+    Fits one candidate on the first n_resources rows of a shuffled fold
+    and times fit and prediction. Runs inside a joblib worker.
+    """
+    order = np.random.default_rng(seed + fold).permutation(X_train.shape[0])[:n_resources]
+
+    # n_jobs=1 inside workers: parallelism is across candidates and folds
+    model = build_classifier(model_type, {**params, "n_jobs": 1} if model_type == "logistic" else params)
+
+    start = time.perf_counter()
+    model.fit(X_train[order], y_train[order])
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_val)
+    predict_time = time.perf_counter() - start
+
+    return {
+        "candidate": candidate_id,
+        "model_type": model_type,
+        "params": params,
+        "fold": fold,
+        "n_resources": int(len(order)),
+        "accuracy": accuracy_score(y_val, y_pred),
+        "f1": f1_score(y_val, y_pred),
+        "fit_time": fit_time,
+        "latency_us": 1e6 * predict_time / X_val.shape[0],
+    }
+
+
+class ModelSelection:
+    """
+    Successive-halving search over linear text classifiers.
+    TF-IDF is fitted once per CV fold (and cached), then every candidate in
+    every round reuses those matrices; candidates x folds run in parallel.
+    """
+
+    def __init__(self, param_grids=None, n_splits=3, factor=3, min_resources=2000,
+                 n_jobs=-1, random_state=42, cache_dir="artifacts/feature_cache"):
+        self.param_grids = param_grids or PARAM_GRIDS
+        self.n_splits = n_splits
+        self.factor = factor
+        self.min_resources = min_resources
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.cache = FeatureCache(cache_dir)
+
+    def _fold_features(self, csv_path):
+        """
+        Returns one (X_train, y_train, X_val, y_val) tuple per fold,
+        loading fitted fold matrices from the feature cache when available
+        """
+        dataset_hash = file_sha256(csv_path)
+        vectorizer_params = build_vectorizer().get_params()
+        keys = [
+            FeatureCache.make_key(dataset_hash, vectorizer_params, "cv", self.n_splits, self.random_state, fold)
+            for fold in range(self.n_splits)
+        ]
+
+        if not all(self.cache.exists(key) for key in keys):
+            df = pd.read_csv(csv_path, usecols=["text", "label"])
+            df = df.dropna(subset=["text"])
+            texts = df["text"].map(clean_text).to_numpy()
+            labels = df["label"].to_numpy()
+
+            splitter = StratifiedKFold(n_splits=self.n_splits, shuffle=True, random_state=self.random_state)
+            for fold, (train_idx, val_idx) in enumerate(splitter.split(texts, labels)):
+                if self.cache.exists(keys[fold]):
+                    continue
+                logger.info(f"Fitting TF-IDF for fold {fold + 1}/{self.n_splits}")
+                vectorizer = build_vectorizer()
+                self.cache.save(
+                    keys[fold],
+                    vectorizer=vectorizer,
+                    X_train=vectorizer.fit_transform(texts[train_idx]),
+                    X_test=vectorizer.transform(texts[val_idx]),
+                    y_train=labels[train_idx],
+                    y_test=labels[val_idx],
+                    meta={"csv_path": csv_path, "fold": fold}
+                )
+
+        folds = []
+        for key in keys:
+            entry = self.cache.load(key)
+            folds.append((entry["X_train"], entry["y_train"], entry["X_test"], entry["y_test"]))
+        return folds
+
+    def run(self, csv_path: str) -> pd.DataFrame:
+        """
+        Runs successive halving and returns a report with one row per candidate:
+        mean accuracy/F1 over folds at the last round it reached, fit time and
+        per-document prediction latency
+        """
+        try:
+            logger.info("Starting model selection (successive halving)")
+
+            folds = self._fold_features(csv_path)
+            max_resources = min(X_train.shape[0] for X_train, _, _, _ in folds)
+
+            candidates = _expand_candidates(self.param_grids)
+            remaining = list(range(len(candidates)))
+            n_rounds = max(1, math.ceil(math.log(len(candidates), self.factor)) + 1)
+            history = []
+
+            for round_idx in range(n_rounds):
+                is_last = len(remaining) == 1 or round_idx == n_rounds - 1
+                n_resources = max_resources if is_last else min(
+                    max_resources, self.min_resources * self.factor ** round_idx
+                )
+                logger.info(f"Round {round_idx + 1}: {len(remaining)} candidates on {n_resources} rows per fold")
+
+                start = time.perf_counter()
+                results = Parallel(n_jobs=self.n_jobs)(
+                    delayed(_evaluate_candidate)(
+                        cid, *candidates[cid], fold, X_train, y_train, X_val, y_val,
+                        n_resources, self.random_state
+                    )
+                    for cid in remaining
+                    for fold, (X_train, y_train, X_val, y_val) in enumerate(folds)
+                )
+                logger.info(f"Round {round_idx + 1} wall time: {time.perf_counter() - start:.2f}s")
+
+                round_df = pd.DataFrame(results)
+                round_df["round"] = round_idx + 1
+                history.append(round_df)
+
+                if is_last:
+                    break
+
+                ranking = (
+                    round_df.groupby("candidate")[["accuracy", "latency_us"]].mean()
+                    .sort_values(["accuracy", "latency_us"], ascending=[False, True])
+                )
+                remaining = list(ranking.index[:max(1, math.ceil(len(remaining) / self.factor))])
+
+            history = pd.concat(history, ignore_index=True)
+            last_round = history.loc[history.groupby("candidate")["round"].transform("max") == history["round"]]
+
+            report = (
+                last_round.groupby("candidate")
+                .agg(
+                    model_type=("model_type", "first"),
+                    params=("params", "first"),
+                    round=("round", "first"),
+                    n_resources=("n_resources", "first"),
+                    accuracy=("accuracy", "mean"),
+                    f1=("f1", "mean"),
+                    fit_time=("fit_time", "sum"),
+                    latency_us=("latency_us", "mean"),
+                )
+                .sort_values(["round", "accuracy", "latency_us"], ascending=[False, False, True])
+                .reset_index(drop=True)
+            )
+
+            logger.info("Model selection report:\n" + report.to_string())
+            return report
+
+        except Exception as e:
+            logger.error("Error during model selection")
+            raise CustomException(e)
+
+    @staticmethod
+    def select_best(report: pd.DataFrame, max_latency_us=None) -> dict:
+        """
+        Picks the most accurate fully-evaluated candidate, optionally within
+        a per-document latency budget
+        """
+        if max_latency_us is not None and (report["latency_us"] <= max_latency_us).any():
+            report = report[report["latency_us"] <= max_latency_us]
+
+        # Only compare candidates evaluated on the same (largest) resource budget
+        finalists = report[report["round"] == report["round"].max()]
+
+        best = finalists.sort_values(["accuracy", "latency_us"], ascending=[False, True]).iloc[0]
+        logger.info(f"Best model: {best['model_type']} {best['params']} "
+                    f"(accuracy={best['accuracy']:.4f}, latency={best['latency_us']:.1f}us/doc)")
+        return {"model_type": best["model_type"], "params": best["params"]}
+
+
+if __name__ == "__main__":
+    selector = ModelSelection()
+    report = selector.run("data/processed/fake_news_full.csv")
+    report.to_csv("artifacts/model_selection_report.csv", index=False)
+    logger.info("Model selection report:\n" + report.to_string(index=False))
+    best = selector.select_best(report)
+    logger.info(f"Train it with DataTransformation(model_type={best['model_type']!r}, model_params={best['params']!r})")
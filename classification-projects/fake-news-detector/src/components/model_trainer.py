@@ -1,7 +1,12 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
 from sklearn.metrics import classification_report, f1_score, accuracy_score
-from src.logger import get_logger
+from src.logger import get_logger, log_stage
 from src.exception import CustomException
 from src.utils import save_object, load_object
+from src.components.inference_artifact import export_inference_artifact, FastScorer
+from src.components.drift_monitor import text_stats, build_baseline, save_baseline
 
 logger = get_logger(__name__)
 
@@ -51,13 +56,90 @@ class ModelTrainer:
             if self.pipeline is None:
                 raise ValueError("Pipeline not provided to ModelTrainer")
 
-            save_object(file_path, self.pipeline)
+            with log_stage("save_pipeline", logger=logger, path=file_path):
+                save_object(file_path, self.pipeline)
             logger.info(f"Pipeline saved successfully at: {file_path}")
 
         except Exception as e:
             logger.error("Error saving the pipeline")
             raise CustomException(e)
 
+    def export_inference_artifact(self, out_dir="artifacts/inference"):
+        """
+        Exports a compact, memory-mappable inference artifact for FastScorer
+        """
+        try:
+            if self.pipeline is None:
+                raise ValueError("Pipeline not provided to ModelTrainer")
+
+            return export_inference_artifact(self.pipeline, out_dir)
+
+        except Exception as e:
+            logger.error("Error exporting the inference artifact")
+            raise CustomException(e)
+
+    def export_compressed_artifacts(self, X_test, y_test, out_dir="artifacts/inference_variants",
+                                    variants=((1.0, "float32"), (0.2, "float32"), (0.2, "int8"), (0.05, "int8"))):
+        """
+        Exports pruned/quantized inference artifacts, one per (keep_fraction, weight_dtype)
+        variant, and reports accuracy, F1, agreement with the full model and size on disk
+        Returns: DataFrame with one row per variant (the full model first)
+        """
+        try:
+            if self.pipeline is None:
+                raise ValueError("Pipeline not provided to ModelTrainer")
+
+            X_test = list(X_test)
+            full_preds = self.pipeline.predict(X_test)
+            rows = []
+
+            for keep_fraction, weight_dtype in ((1.0, "float64"),) + tuple(variants):
+                name = f"keep{keep_fraction:g}_{weight_dtype}"
+                variant_dir = Path(out_dir) / name
+                export_inference_artifact(self.pipeline, variant_dir, keep_fraction, weight_dtype)
+
+                preds = FastScorer(variant_dir).score(X_test)[0]
+                rows.append({
+                    "variant": name,
+                    "keep_fraction": keep_fraction,
+                    "weight_dtype": weight_dtype,
+                    "size_mb": round(sum(f.stat().st_size for f in variant_dir.iterdir()) / 1024 ** 2, 3),
+                    "accuracy": accuracy_score(y_test, preds),
+                    "f1": f1_score(y_test, preds),
+                    "agreement": float(np.mean(preds == full_preds)),
+                })
+
+            report = pd.DataFrame(rows)
+            report["size_ratio"] = (report["size_mb"] / report["size_mb"].iloc[0]).round(3)
+            report.to_csv(Path(out_dir) / "compression_report.csv", index=False)
+            logger.info("Compressed artifact report:\n" + report.to_string(index=False))
+            return report
+
+        except Exception as e:
+            logger.error("Error exporting compressed artifacts")
+            raise CustomException(e)
+
+    def build_drift_baseline(self, X_test, file_path="artifacts/drift_baseline.json"):
+        """
+        Saves training-time reference sketches (score histogram, text length
+        histogram, OOV rate) used by DriftMonitor in the prediction path
+        """
+        try:
+            if self.pipeline is None:
+                raise ValueError("Pipeline not provided to ModelTrainer")
+
+            vectorizer = self.pipeline.steps[0][1]
+            prob_real = self.pipeline.predict_proba(X_test)[:, 1]
+            n_tokens, n_known = text_stats(vectorizer, list(X_test))
+
+            baseline = build_baseline(prob_real, n_tokens, n_known)
+            save_baseline(baseline, file_path)
+            return baseline
+
+        except Exception as e:
+            logger.error("Error building the drift baseline")
+            raise CustomException(e)
+
     def load_pipeline(self, file_path="artifacts/fake_news_pipeline.pkl"):
         """
         Load a saved pipeline
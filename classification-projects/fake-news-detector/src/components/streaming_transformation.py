@@ -0,0 +1,160 @@
+from sklearn.pipeline import Pipeline
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import classification_report, f1_score, accuracy_score
+import numpy as np
+import pandas as pd
+
+from src.logger import get_logger
+from src.exception import CustomException
+from src.components.data_transformation import clean_text
+
+logger = get_logger(__name__)
+
+
+class StreamingDataTransformation:
+    """
+    Out-of-core alternative to DataTransformation.
+    Uses a stateless HashingVectorizer and SGDClassifier.partial_fit over
+    chunked reads of the ingested CSV, so memory is bounded by the chunk size
+    rather than by the corpus or its vocabulary.
+    """
+
+    def __init__(self, n_features=2**20, chunksize=50000, n_epochs=1, classes=(0, 1)):
+        """
+        Initialize the streaming pipeline
+        """
+        self.chunksize = chunksize
+        self.n_epochs = n_epochs
+        self.classes = np.array(classes)
+
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words="english",
+            alternate_sign=False,
+            norm="l2"
+        )
+        self.model = SGDClassifier(loss="log_loss", alpha=1e-6, random_state=42)
+
+        self.pipeline = Pipeline(
+            steps=[
+                ("hashing", self.vectorizer),
+                ("classifier", self.model)
+            ]
+        )
+
+    @classmethod
+    def from_pipeline(cls, pipeline, **kwargs):
+        """
+        Wraps a previously saved streaming pipeline so new articles can be
+        folded in with partial_fit
+        """
+        obj = cls(**kwargs)
+        obj.vectorizer = pipeline.named_steps["hashing"]
+        obj.model = pipeline.named_steps["classifier"]
+        obj.pipeline = pipeline
+        return obj
+
+    def _read_chunks(self, csv_path):
+        """
+        Yields cleaned (text, label) chunks from the ingested CSV
+        """
+        reader = pd.read_csv(
+            csv_path,
+            usecols=["text", "label"],
+            dtype={"text": "string", "label": "int8"},
+            chunksize=self.chunksize
+        )
+        for chunk in reader:
+            chunk = chunk.dropna(subset=["text"])
+            yield chunk["text"].map(clean_text), chunk["label"].to_numpy()
+
+    def _split_mask(self, n_rows, chunk_idx, test_size, random_state):
+        """
+        Deterministic per-chunk hold-out mask, so the same rows are held out
+        on every epoch and on the evaluation pass
+        """
+        rng = np.random.default_rng(random_state + chunk_idx)
+        return rng.random(n_rows) < test_size
+
+    def _class_weights(self, csv_path):
+        """
+        Computes 'balanced' class weights from a label-only pass over the CSV,
+        since partial_fit cannot infer them from a single chunk
+        """
+        counts = pd.Series(0, index=self.classes, dtype="int64")
+        for chunk in pd.read_csv(csv_path, usecols=["label"], dtype={"label": "int8"},
+                                 chunksize=self.chunksize * 10):
+            counts = counts.add(chunk["label"].value_counts(), fill_value=0)
+
+        total = counts.sum()
+        return {int(c): total / (len(self.classes) * counts[c]) for c in self.classes if counts[c] > 0}
+
+    def partial_fit(self, texts, labels, sample_weight=None):
+        """
+        Folds a batch of new articles into the current model without a refit
+        """
+        try:
+            texts = pd.Series(texts).map(clean_text)
+            X = self.vectorizer.transform(texts)
+            self.model.partial_fit(X, np.asarray(labels), classes=self.classes,
+                                   sample_weight=sample_weight)
+            return self.pipeline
+
+        except Exception as e:
+            logger.error("Error during incremental model update")
+            raise CustomException(e)
+
+    def initiate_streaming_training(self, csv_path: str, test_size=0.2, random_state=42):
+        """
+        Streams the CSV in chunks, trains with partial_fit on the training rows
+        and evaluates on the held-out rows in a second pass.
+        Returns fitted pipeline, F1 and accuracy on the held-out rows
+        """
+        try:
+            logger.info(f"Starting streaming training (chunksize={self.chunksize}, epochs={self.n_epochs})")
+
+            class_weights = self._class_weights(csv_path)
+            logger.info(f"Class weights: {class_weights}")
+            weight_lookup = np.array([class_weights.get(int(c), 1.0) for c in self.classes])
+
+            for epoch in range(self.n_epochs):
+                n_seen = 0
+                for chunk_idx, (texts, labels) in enumerate(self._read_chunks(csv_path)):
+                    test_mask = self._split_mask(len(labels), chunk_idx, test_size, random_state)
+                    train_texts = texts[~test_mask]
+                    train_labels = labels[~test_mask]
+                    if len(train_labels) == 0:
+                        continue
+
+                    weights = weight_lookup[np.searchsorted(self.classes, train_labels)]
+                    X = self.vectorizer.transform(train_texts)
+                    self.model.partial_fit(X, train_labels, classes=self.classes, sample_weight=weights)
+                    n_seen += len(train_labels)
+
+                logger.info(f"Epoch {epoch + 1}/{self.n_epochs} done, trained on {n_seen} rows")
+
+            y_true, y_pred = [], []
+            for chunk_idx, (texts, labels) in enumerate(self._read_chunks(csv_path)):
+                test_mask = self._split_mask(len(labels), chunk_idx, test_size, random_state)
+                if not test_mask.any():
+                    continue
+                X = self.vectorizer.transform(texts[test_mask])
+                y_true.append(labels[test_mask])
+                y_pred.append(self.model.predict(X))
+
+            y_true = np.concatenate(y_true)
+            y_pred = np.concatenate(y_pred)
+
+            f1 = f1_score(y_true, y_pred)
+            accuracy = accuracy_score(y_true, y_pred)
+            logger.info(f"Accuracy on held-out rows: {accuracy:.4f}")
+            logger.info(f"F1 Score on held-out rows: {f1:.4f}")
+            logger.info("\n" + classification_report(y_true, y_pred))
+
+            return self.pipeline, f1, accuracy
+
+        except Exception as e:
+            logger.error("Error during streaming training")
+            raise CustomException(e)
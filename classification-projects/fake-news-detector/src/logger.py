@@ -1,13 +1,31 @@
 import logging
 import os
+import sys
+import json
+import time
+import random
+import cProfile
+import functools
+import threading
+import tracemalloc
+from contextlib import contextmanager
 from datetime import datetime
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE = f"log_{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.log"
 LOG_PATH = os.path.join(LOG_DIR, LOG_FILE)
 
+# Structured per-stage metrics (one JSON object per line) and cProfile dumps
+METRICS_PATH = os.path.join(LOG_DIR, LOG_FILE.replace("log_", "metrics_").replace(".log", ".jsonl"))
+PROFILE_DIR = os.path.join(LOG_DIR, "profiles")
+
 logging.basicConfig(
     filename=LOG_PATH,
     format="[ %(asctime)s ] %(levelname)s %(message)s",
@@ -17,4 +35,135 @@ logging.basicConfig(
 def get_logger(name=__name__):
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    return logger
\ No newline at end of file
+    return logger
+
+
+_metrics_lock = threading.Lock()
+_stage_stack = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def _max_rss_mb():
+    """
+    Process peak resident memory (kilobytes on Linux, bytes on macOS)
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 ** 2 if sys.platform == "darwin" else 1024), 2)
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def _write_metrics(record):
+    with _metrics_lock:
+        with open(METRICS_PATH, "a") as file:
+            file.write(json.dumps(record, default=str) + "\n")
+
+
+@contextmanager
+def log_stage(name, logger=None, memory=False, profile=False, sample=1.0, **fields):
+    """
+    Times a pipeline stage and appends duration, process peak RSS, row count
+    and status to the structured metrics log. Yields a dict the caller can
+    update (e.g. stage["rows"] = len(df)). Exceptions (including CustomException)
+    are recorded as failed and re-raised unchanged.
+    memory=True additionally records the stage's peak traced memory; tracemalloc
+    slows every allocation and is process-wide, so it is opt-in and peaks are
+    only meaningful when one stage runs at a time.
+    With profile=True a cProfile dump is written to logs/profiles/.
+    sample < 1 records only that fraction of successful calls (hot paths).
+    """
+    logger = logger or get_logger(__name__)
+    stage = {"stage": name, "rows": None, **fields}
+
+    # Nested stages share tracemalloc: the parent keeps the max peak of its children
+    stack = getattr(_stage_stack, "frames", None)
+    if stack is None:
+        stack = _stage_stack.frames = []
+    frame = {"max_peak": 0}
+    if memory:
+        if stack and tracemalloc.is_tracing():
+            stack[-1]["max_peak"] = max(stack[-1]["max_peak"], tracemalloc.get_traced_memory()[1])
+        _start_tracing()
+        tracemalloc.reset_peak()
+    stack.append(frame)
+
+    profiler = cProfile.Profile() if profile else None
+    if profiler:
+        profiler.enable()
+
+    start = time.perf_counter()
+    stage["status"] = "completed"
+    try:
+        yield stage
+    except BaseException as e:
+        stage["status"] = "failed"
+        stage["error"] = str(e)
+        raise
+    finally:
+        stage["duration_s"] = round(time.perf_counter() - start, 4)
+
+        if profiler:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            stage["profile"] = os.path.join(
+                PROFILE_DIR, f"{name}_{datetime.now().strftime('%Y_%m_%d_%H_%M_%S')}.prof"
+            )
+            profiler.dump_stats(stage["profile"])
+
+        stack.pop()
+        if memory:
+            peak = max(tracemalloc.get_traced_memory()[1], frame["max_peak"])
+            stage["peak_memory_mb"] = round(peak / 1024 ** 2, 2)
+            if stack:
+                stack[-1]["max_peak"] = max(stack[-1]["max_peak"], peak)
+            _stop_tracing()
+
+        if stage["status"] == "failed" or sample >= 1 or random.random() < sample:
+            stage["max_rss_mb"] = _max_rss_mb()
+            stage["finished_at"] = datetime.now().isoformat()
+            _write_metrics(stage)
+
+            summary = f"Stage '{name}' {stage['status']} in {stage['duration_s']:.2f}s"
+            if "peak_memory_mb" in stage:
+                summary += f", peak memory {stage['peak_memory_mb']:.1f} MB"
+            if stage["rows"] is not None:
+                summary += f", rows {stage['rows']}"
+            logger.info(summary)
+
+
+def timed(name=None, memory=False, profile=False):
+    """
+    Decorator form of log_stage. Row count is taken from the result when it
+    has a shape (DataFrame, array, sparse matrix).
+    """
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with log_stage(stage_name, logger=get_logger(func.__module__),
+                           memory=memory, profile=profile) as stage:
+                result = func(*args, **kwargs)
+                if hasattr(result, "shape"):
+                    stage["rows"] = result.shape[0]
+                return result
+
+        return wrapper
+    return decorator
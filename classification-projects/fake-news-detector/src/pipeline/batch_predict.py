@@ -0,0 +1,165 @@
+import argparse
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from src.components.data_transformation import clean_text
+from src.pipeline.predict_pipeline import Predictor
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+# One Predictor per worker process; with an inference artifact directory the
+# arrays are memory-mapped, so workers share the same pages of the model files
+_worker_predictor = None
+
+
+def _init_worker(model_path):
+    global _worker_predictor
+    _worker_predictor = Predictor(model_path)
+
+
+def _score_batch(texts, top_n=0):
+    """
+    Cleans and scores one batch inside a worker process;
+    with top_n > 0 also returns the top contributing n-grams per text
+    """
+    cleaned = [clean_text(t) for t in texts]
+    if top_n > 0:
+        return _worker_predictor.predict_with_explanation(cleaned, top_n=top_n)
+    labels, probs = _worker_predictor.predict_with_proba(cleaned)
+    return labels, probs, None
+
+
+def _read_batches(input_path, text_column, batch_size):
+    """
+    Streams the input CSV or JSONL file in batches of rows
+    """
+    if Path(input_path).suffix in (".jsonl", ".json"):
+        reader = pd.read_json(input_path, lines=True, chunksize=batch_size)
+    else:
+        reader = pd.read_csv(input_path, chunksize=batch_size)
+
+    for chunk in reader:
+        chunk[text_column] = chunk[text_column].fillna("").astype(str)
+        yield chunk
+
+
+class _ResultWriter:
+    """
+    Appends scored batches to a CSV or JSONL output file
+    """
+
+    def __init__(self, output_path):
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.is_jsonl = self.output_path.suffix in (".jsonl", ".json")
+        self.file = open(self.output_path, "w", newline="")
+        self.wrote_header = False
+
+    def write(self, df):
+        if self.is_jsonl:
+            df.to_json(self.file, orient="records", lines=True)
+        else:
+            df.to_csv(self.file, index=False, header=not self.wrote_header)
+            self.wrote_header = True
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def run_batch_prediction(input_path, output_path, model_path="artifacts/inference",
+                         text_column="text", id_column=None, batch_size=1000, n_workers=4,
+                         explain_top_n=0):
+    """
+    Scores a large CSV/JSONL of articles in batches across worker processes,
+    writing results incrementally in input order.
+    Returns the number of scored rows.
+    """
+    try:
+        logger.info(f"Batch scoring {input_path} -> {output_path} "
+                    f"(batch_size={batch_size}, workers={n_workers})")
+
+        writer = _ResultWriter(output_path)
+        pending = deque()
+        n_rows = 0
+        start = time.perf_counter()
+
+        def flush_one():
+            nonlocal n_rows
+            chunk, future = pending.popleft()
+            labels, probs, explanations = future.result()
+
+            out = pd.DataFrame({
+                "label": labels,
+                "prediction": ["Real" if l == 1 else "Fake" for l in labels],
+                "prob_fake": probs[:, 0],
+                "prob_real": probs[:, 1],
+            })
+            if id_column is not None:
+                out.insert(0, id_column, chunk[id_column].to_numpy())
+            if explanations is not None:
+                out["top_terms"] = [
+                    json.dumps({t["term"]: round(t["contribution"], 6) for t in terms})
+                    for terms in explanations
+                ]
+
+            writer.write(out)
+            n_rows += len(out)
+
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(str(model_path),)) as executor:
+                for chunk in _read_batches(input_path, text_column, batch_size):
+                    # Bound the number of in-flight batches to keep memory flat
+                    if len(pending) >= 2 * n_workers:
+                        flush_one()
+                    pending.append((chunk, executor.submit(
+                        _score_batch, chunk[text_column].tolist(), explain_top_n
+                    )))
+
+                while pending:
+                    flush_one()
+        finally:
+            writer.close()
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Batch scoring completed: {n_rows} rows in {elapsed:.1f}s "
+                    f"({n_rows / max(elapsed, 1e-9):.0f} rows/s)")
+        return n_rows
+
+    except Exception as e:
+        logger.error("Batch scoring failed")
+        raise CustomException(e)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch fake news scoring")
+    parser.add_argument("input", help="CSV or JSONL file of articles")
+    parser.add_argument("output", help="CSV or JSONL file for predictions")
+    parser.add_argument("--model", default="artifacts/inference",
+                        help="Inference artifact directory or pickled pipeline")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--explain", type=int, default=0,
+                        help="Add the top N contributing n-grams per article")
+    args = parser.parse_args()
+
+    n = run_batch_prediction(
+        args.input, args.output,
+        model_path=args.model,
+        text_column=args.text_column,
+        id_column=args.id_column,
+        batch_size=args.batch_size,
+        n_workers=args.workers,
+        explain_top_n=args.explain
+    )
+    print(json.dumps({"scored": n, "output": args.output}))
@@ -1,19 +1,124 @@
+from pathlib import Path
+import numpy as np
 from src.components.model_trainer import ModelTrainer
+from src.components.inference_artifact import FastScorer, top_term_contributions
+from src.components.drift_monitor import text_stats
 from src.utils import load_object
-from src.logger import get_logger
+from src.logger import get_logger, log_stage
 from src.exception import CustomException
 
 logger = get_logger(__name__)
 
+PREDICT_METRICS_SAMPLE = 0.01
+
 class Predictor:
-    def __init__(self, pipeline_path="artifacts/fake_news_pipeline.pkl"):
+    def __init__(self, pipeline_path="artifacts/fake_news_pipeline.pkl", monitor=None):
+        """
+        pipeline_path is either a pickled pipeline or an exported
+        inference artifact directory (see ModelTrainer.export_inference_artifact).
+        monitor is an optional DriftMonitor fed with every prediction batch.
+        """
         try:
             logger.info(f"Loading pipeline from {pipeline_path}")
-            self.pipeline = load_object(pipeline_path)
+            if Path(pipeline_path).is_dir():
+                self.scorer = FastScorer(pipeline_path)
+                self.pipeline = None
+            else:
+                self.scorer = None
+                self.pipeline = load_object(pipeline_path)
+            self._feature_names = None
+            self._warned_no_explain = False
+            self.monitor = monitor
         except Exception as e:
             logger.error("Failed to load pipeline")
             raise CustomException(e)
 
+    def _score(self, texts, top_n=0):
+        """
+        Single transform -> labels, probabilities and (if top_n > 0) explanations.
+        Feeds the drift monitor when one is attached.
+        """
+        # Request path: only a sample of calls is written to the metrics log
+        with log_stage("predict", logger=logger, sample=PREDICT_METRICS_SAMPLE) as stage:
+            stage["rows"] = len(texts)
+            explanations, stats = None, None
+
+            if self.scorer is not None:
+                X, stats = self.scorer.transform(texts, return_stats=True)
+                preds, probs = self.scorer.predict_matrix(X)
+                if top_n > 0:
+                    explanations = top_term_contributions(
+                        X, self.scorer.coef, self.scorer.feature_names(), top_n, self.scorer.coef_scale
+                    )
+            else:
+                vectorizer = self.pipeline.steps[0][1]
+                classifier = self.pipeline.steps[-1][1]
+
+                if top_n > 0:
+                    # Term contributions need coef_ (not e.g. calibrated SVMs or naive Bayes)
+                    # and term names (not a HashingVectorizer)
+                    if not hasattr(classifier, "coef_"):
+                        reason = f"{type(classifier).__name__} has no coef_"
+                    elif not hasattr(vectorizer, "get_feature_names_out"):
+                        reason = f"{type(vectorizer).__name__} has no feature names"
+                    else:
+                        reason = None
+                    if reason is not None:
+                        if not self._warned_no_explain:
+                            logger.warning(f"{reason}, skipping explanations")
+                            self._warned_no_explain = True
+                        top_n = 0
+                        explanations = [[] for _ in texts]
+
+                if top_n > 0:
+                    if self._feature_names is None:
+                        self._feature_names = vectorizer.get_feature_names_out()
+                    X = vectorizer.transform(texts)
+                    probs = classifier.predict_proba(X)
+                    explanations = top_term_contributions(
+                        X, classifier.coef_.ravel(), self._feature_names, top_n
+                    )
+                else:
+                    probs = self.pipeline.predict_proba(texts)
+                preds = classifier.classes_[np.argmax(probs, axis=1)]
+
+                if self.monitor is not None and hasattr(vectorizer, "vocabulary_"):
+                    stats = text_stats(vectorizer, texts)
+
+            if self.monitor is not None and stats is not None:
+                self.monitor.update(probs[:, 1], *stats)
+
+            return preds, probs, explanations
+
+    def predict_with_proba(self, texts):
+        """
+        Predict labels and probabilities with a single transform
+        Returns: (array of 0/1 labels, array of [prob_fake, prob_real])
+        """
+        try:
+            if isinstance(texts, str):
+                texts = [texts]
+            preds, probs, _ = self._score(texts)
+            return preds, probs
+        except Exception as e:
+            logger.error("Prediction failed")
+            raise CustomException(e)
+
+    def predict_with_explanation(self, texts, top_n=10):
+        """
+        Predict labels and probabilities plus the top contributing n-grams per text
+        (TF-IDF weight x coefficient), using a single transform. Classifiers
+        without coef_ and hashed features get empty explanations.
+        Returns: (labels, probabilities, explanations)
+        """
+        try:
+            if isinstance(texts, str):
+                texts = [texts]
+            return self._score(texts, top_n=top_n)
+        except Exception as e:
+            logger.error("Prediction explanation failed")
+            raise CustomException(e)
+
     def predict(self, texts):
         """
         Predict fake/real for a list of texts
@@ -22,6 +127,8 @@ class Predictor:
         try:
             if isinstance(texts, str):
                 texts = [texts]
+            if self.scorer is not None:
+                return self.scorer.score(texts)[0]
             preds = self.pipeline.predict(texts)
             return preds
         except Exception as e:
@@ -36,6 +143,8 @@ class Predictor:
         try:
             if isinstance(texts, str):
                 texts = [texts]
+            if self.scorer is not None:
+                return self.scorer.score(texts)[1]
             probs = self.pipeline.predict_proba(texts)
             return probs
         except Exception as e:
@@ -50,8 +159,7 @@ if __name__ == "__main__":
         "This news article is completely fabricated for testing."
     ]
 
-    predictions = predictor.predict(sample_texts)
-    probabilities = predictor.predict_proba(sample_texts)
+    predictions, probabilities = predictor.predict_with_proba(sample_texts)
 
     for text, pred, prob in zip(sample_texts, predictions, probabilities):
         label = "Real" if pred == 1 else "Fake"
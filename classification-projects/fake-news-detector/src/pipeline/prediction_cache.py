@@ -0,0 +1,134 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from src.components.data_transformation import clean_text
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+
+def artifact_fingerprint(path) -> str:
+    """
+    Cheap fingerprint of a model file or artifact directory (names, sizes, mtimes)
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = sorted(p for p in path.rglob("*") if p.is_file())
+    else:
+        files = [path] if path.exists() else []
+    digest = hashlib.sha256()
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction results keyed on the hash of the
+    normalized (clean_text) article. Bounded by entry count and approximate
+    bytes, and cleared when the model artifact fingerprint changes.
+    """
+
+    def __init__(self, model_path, max_entries=10000, max_bytes=32 * 1024 * 1024, check_interval=5.0,
+                 explain_top_n=0):
+        self.model_path = model_path
+        self.explain_top_n = explain_top_n
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._fingerprint = artifact_fingerprint(model_path)
+        self._last_check = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(normalized_text) -> str:
+        return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+    def _check_model(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        fingerprint = artifact_fingerprint(self.model_path)
+        if fingerprint != self._fingerprint:
+            logger.info("Model artifact changed, clearing prediction cache")
+            self._fingerprint = fingerprint
+            self._entries.clear()
+            self._bytes = 0
+
+    def get(self, key):
+        with self._lock:
+            self._check_model()
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = len(key) + len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def predict(self, predictor, texts):
+        """
+        Cached predictor.predict_with_proba over normalized texts.
+        Returns: list of (label, [prob_fake, prob_real], top_terms) tuples;
+        top_terms is empty unless explain_top_n > 0
+        """
+        try:
+            if isinstance(texts, str):
+                texts = [texts]
+
+            normalized = [clean_text(t) for t in texts]
+            keys = [self.make_key(t) for t in normalized]
+
+            # Repeated texts in a batch are looked up and scored once
+            texts_by_key = dict(zip(reversed(keys), reversed(normalized)))
+            results = {key: self.get(key) for key in dict.fromkeys(keys)}
+
+            missing = [key for key, result in results.items() if result is None]
+            if missing:
+                missing_texts = [texts_by_key[key] for key in missing]
+                if self.explain_top_n > 0:
+                    labels, probs, explanations = predictor.predict_with_explanation(
+                        missing_texts, top_n=self.explain_top_n
+                    )
+                else:
+                    labels, probs = predictor.predict_with_proba(missing_texts)
+                    explanations = [[] for _ in missing]
+
+                for key, label, prob, terms in zip(missing, labels, probs, explanations):
+                    results[key] = (int(label), [float(p) for p in prob], terms)
+                    self.put(key, results[key])
+
+            return [results[key] for key in keys]
+
+        except Exception as e:
+            logger.error("Cached prediction failed")
+            raise CustomException(e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes,
+                    "hits": self.hits, "misses": self.misses}
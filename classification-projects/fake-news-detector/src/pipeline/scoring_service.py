@@ -0,0 +1,170 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.components.data_transformation import clean_text
+from src.pipeline.predict_pipeline import Predictor
+from src.components.drift_monitor import DriftMonitor
+from src.logger import get_logger
+from src.exception import CustomException
+
+logger = get_logger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent scoring requests and scores them together.
+    A batch is flushed when it reaches max_batch_size or when the oldest
+    request has waited max_wait_ms.
+    """
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=10):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, texts) -> Future:
+        """
+        Queues a list of texts; the future resolves to (labels, probabilities)
+        """
+        future = Future()
+        self.requests.put((texts, future))
+        return future
+
+    def _collect(self):
+        batch = [self.requests.get()]
+        n_texts = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while n_texts < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            n_texts += len(item[0])
+        return batch
+
+    def _score(self, batch):
+        texts = [clean_text(t) for item_texts, _ in batch for t in item_texts]
+        labels, probs = self.predictor.predict_with_proba(texts)
+
+        offset = 0
+        for item_texts, future in batch:
+            n = len(item_texts)
+            future.set_result((labels[offset:offset + n], probs[offset:offset + n]))
+            offset += n
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                self._score(batch)
+                continue
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                logger.warning(f"Batch of {len(batch)} requests failed ({e}), retrying one by one")
+
+            # Only the offending request(s) fail
+            for item in batch:
+                try:
+                    self._score([item])
+                except Exception as e:
+                    item[1].set_exception(e)
+
+
+def _make_handler(batcher, timeout):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                texts = payload.get("texts", [payload.get("text")])
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("Body must contain 'text' (string) or 'texts' (list of strings)")
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            try:
+                labels, probs = batcher.submit(texts).result(timeout=timeout)
+            except Exception as e:
+                logger.error(CustomException(e))
+                self._send_json(500, {"error": "prediction failed"})
+                return
+
+            self._send_json(200, {"predictions": [
+                {
+                    "label": "Real" if label == 1 else "Fake",
+                    "prob_fake": float(prob[0]),
+                    "prob_real": float(prob[1]),
+                }
+                for label, prob in zip(labels, probs)
+            ]})
+
+        def log_message(self, format, *args):
+            logger.info("%s - %s" % (self.address_string(), format % args))
+
+    return ScoringHandler
+
+
+def serve(model_path="artifacts/inference", host="127.0.0.1", port=8000,
+          max_batch_size=64, max_wait_ms=10, timeout=30, drift_baseline=None):
+    """
+    Runs the HTTP scoring endpoint: POST /predict {"text": ...} or {"texts": [...]}
+    With drift_baseline, every scored batch feeds a DriftMonitor.
+    """
+    monitor = DriftMonitor.from_baseline_file(drift_baseline) if drift_baseline else None
+    predictor = Predictor(model_path, monitor=monitor)
+    batcher = MicroBatcher(predictor, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    server = ThreadingHTTPServer((host, port), _make_handler(batcher, timeout))
+
+    logger.info(f"Scoring service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake news scoring HTTP service")
+    parser.add_argument("--model", default="artifacts/inference")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=10)
+    parser.add_argument("--drift-baseline", default=None,
+                        help="Training baseline JSON (artifacts/drift_baseline.json) to monitor drift")
+    args = parser.parse_args()
+
+    serve(args.model, args.host, args.port, args.max_batch_size, args.max_wait_ms,
+          drift_baseline=args.drift_baseline)
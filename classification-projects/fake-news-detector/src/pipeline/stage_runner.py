@@ -0,0 +1,114 @@
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from src.logger import get_logger, log_stage
+from src.exception import CustomException
+from src.utils import file_sha256
+
+logger = get_logger(__name__)
+
+
+class StageRunner:
+    """
+    Runs pipeline stages and records their inputs/outputs with content hashes
+    in a JSON state file. A stage is skipped when its params and input hashes
+    are unchanged and its recorded outputs are still intact, so re-running a
+    failed pipeline resumes from the first stage that did not complete.
+    """
+
+    def __init__(self, state_path="artifacts/pipeline_state.json", force=(), profile=False):
+        self.state_path = Path(state_path)
+        self.force = set(force)
+        self.profile = profile
+        self.state = {"stages": {}, "file_hashes": {}}
+        if self.state_path.exists():
+            with open(self.state_path) as file:
+                self.state = json.load(file)
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as file:
+            json.dump(self.state, file, indent=2, default=str)
+        tmp_path.replace(self.state_path)
+
+    def _file_hash(self, path: Path) -> str:
+        # Content hashes are memoized on (size, mtime) so unchanged files are not re-read
+        stat = path.stat()
+        memo = self.state["file_hashes"].get(str(path))
+        if memo and memo[0] == stat.st_size and memo[1] == stat.st_mtime_ns:
+            return memo[2]
+
+        digest = file_sha256(path)
+        self.state["file_hashes"][str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def _path_hash(self, path):
+        """
+        Content hash of a file or, for a directory, of every file below it
+        (None if the path does not exist)
+        """
+        path = Path(path)
+        if path.is_file():
+            return self._file_hash(path)
+        if not path.is_dir():
+            return None
+
+        digest = hashlib.sha256()
+        for file in sorted(p for p in path.rglob("*") if p.is_file()):
+            digest.update(f"{file.relative_to(path)}:{self._file_hash(file)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _input_hash(self, inputs, params):
+        payload = {
+            "inputs": {str(p): self._path_hash(p) for p in inputs},
+            "params": params,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _is_up_to_date(self, name, input_hash):
+        record = self.state["stages"].get(name)
+        if name in self.force or not record or record.get("status") != "completed":
+            return False
+        if record.get("input_hash") != input_hash:
+            return False
+        return all(self._path_hash(path) == digest for path, digest in record["outputs"].items())
+
+    def run(self, name, func, inputs=(), params=None, outputs=()):
+        """
+        Runs func() unless the stage is up to date.
+        inputs/outputs are file or directory paths; params must be JSON-serializable.
+        """
+        input_hash = self._input_hash(inputs, params or {})
+
+        if self._is_up_to_date(name, input_hash):
+            logger.info(f"Stage '{name}' is up to date, skipping")
+            return self.state["stages"][name].get("result")
+
+        logger.info(f"Running stage '{name}'")
+        started_at = datetime.now().isoformat()
+        try:
+            with log_stage(name, logger=logger, memory=self.profile, profile=self.profile):
+                result = func()
+        except Exception as e:
+            self.state["stages"][name] = {
+                "status": "failed",
+                "input_hash": input_hash,
+                "started_at": started_at,
+                "error": str(e),
+            }
+            self._save_state()
+            raise CustomException(e)
+
+        self.state["stages"][name] = {
+            "status": "completed",
+            "input_hash": input_hash,
+            "outputs": {str(p): self._path_hash(p) for p in outputs},
+            "started_at": started_at,
+            "finished_at": datetime.now().isoformat(),
+            "result": result,
+        }
+        self._save_state()
+        return result
@@ -1,34 +1,133 @@
 from src.components.data_ingestion import DataIngestion
 from src.components.data_transformation import DataTransformation
+from src.components.streaming_transformation import StreamingDataTransformation
 from src.components.model_trainer import ModelTrainer
+from src.pipeline.stage_runner import StageRunner
+from src.utils import save_object, load_object
 from src.logger import get_logger
 from src.exception import CustomException
 
 logger = get_logger(__name__)
 
-def run_training_pipeline():
+STAGE_DIR = "artifacts/stages"
+FITTED_PIPELINE_PATH = f"{STAGE_DIR}/fitted_pipeline.pkl"
+TEST_SPLIT_PATH = f"{STAGE_DIR}/test_split.pkl"
+PIPELINE_PATH = "artifacts/fake_news_pipeline.pkl"
+STREAMING_PIPELINE_PATH = "artifacts/fake_news_streaming_pipeline.pkl"
+INFERENCE_DIR = "artifacts/inference"
+DRIFT_BASELINE_PATH = "artifacts/drift_baseline.json"
+
+
+def run_training_pipeline(mode="batch", force=(), profile=False):
+    """
+    Runs ingestion -> transformation -> evaluation as cached stages.
+    Stages whose inputs are unchanged are skipped, so a failed run resumes
+    from the failed stage; pass stage names in force to re-run them
+    (e.g. force=["ingestion"] to re-scrape). With profile=True each stage
+    also traces peak memory and writes a cProfile dump to logs/profiles/.
+    """
     try:
-        logger.info("=== Starting full training pipeline ===")
+        logger.info(f"=== Starting full training pipeline (mode={mode}) ===")
+        runner = StageRunner(force=force, profile=profile)
+        ingestion = DataIngestion()
+        csv_path = str(ingestion.output_path)
 
         # Step 1: Data ingestion
-        ingestion = DataIngestion()
-        csv_path = ingestion.initiate_data_ingestion(include_scraped=True)
+        runner.run(
+            "ingestion",
+            lambda: ingestion.initiate_data_ingestion(include_scraped=True),
+            inputs=[ingestion.raw_data_dir],
+            params={"include_scraped": True},
+            outputs=[csv_path]
+        )
+
+        if mode == "streaming":
+            # Step 2-3: Out-of-core training, evaluation & save
+            def streaming_training():
+                transformer = StreamingDataTransformation()
+                pipeline, f1, acc = transformer.initiate_streaming_training(csv_path)
+                ModelTrainer(pipeline=pipeline).save_pipeline(STREAMING_PIPELINE_PATH)
+                return {"f1": float(f1), "accuracy": float(acc)}
+
+            metrics = runner.run(
+                "streaming_training",
+                streaming_training,
+                inputs=[csv_path],
+                outputs=[STREAMING_PIPELINE_PATH]
+            )
+            logger.info(f"Streaming training completed. Test F1: {metrics['f1']:.4f}, "
+                        f"Accuracy: {metrics['accuracy']:.4f}")
+            return
 
         # Step 2: Data transformation & pipeline fitting
-        transformer = DataTransformation()
-        pipeline, X_test, y_test = transformer.initiate_data_transformation(csv_path)
+        def transformation():
+            transformer = DataTransformation()
+            pipeline, X_test, y_test = transformer.initiate_data_transformation(csv_path)
+            save_object(FITTED_PIPELINE_PATH, pipeline)
+            save_object(TEST_SPLIT_PATH, (X_test, y_test))
+
+        runner.run(
+            "transformation",
+            transformation,
+            inputs=[csv_path],
+            params={"model_type": "logistic"},
+            outputs=[FITTED_PIPELINE_PATH, TEST_SPLIT_PATH]
+        )
 
         # Step 3: Evaluate & save pipeline
-        trainer = ModelTrainer(pipeline=pipeline)
-        f1, acc, _ = trainer.evaluate_pipeline(X_test, y_test)
-        trainer.save_pipeline("artifacts/fake_news_pipeline.pkl")
+        def evaluation():
+            trainer = ModelTrainer(pipeline=load_object(FITTED_PIPELINE_PATH))
+            X_test, y_test = load_object(TEST_SPLIT_PATH)
+            f1, acc, _ = trainer.evaluate_pipeline(X_test, y_test)
+            trainer.save_pipeline(PIPELINE_PATH)
+            trainer.export_inference_artifact(INFERENCE_DIR)
+            trainer.build_drift_baseline(X_test, DRIFT_BASELINE_PATH)
+            return {"f1": float(f1), "accuracy": float(acc)}
 
-        logger.info(f"Training pipeline completed. Test F1: {f1:.4f}, Accuracy: {acc:.4f}")
+        metrics = runner.run(
+            "evaluation",
+            evaluation,
+            inputs=[FITTED_PIPELINE_PATH, TEST_SPLIT_PATH],
+            outputs=[PIPELINE_PATH, INFERENCE_DIR, DRIFT_BASELINE_PATH]
+        )
+
+        logger.info(f"Training pipeline completed. Test F1: {metrics['f1']:.4f}, "
+                    f"Accuracy: {metrics['accuracy']:.4f}")
 
     except Exception as e:
         logger.error("Training pipeline failed")
         raise CustomException(e)
 
 
+def update_streaming_pipeline(df, pipeline_path=STREAMING_PIPELINE_PATH):
+    """
+    Folds newly scraped articles (DataFrame with text and label) into the
+    saved streaming model with partial_fit, without a full refit
+    """
+    try:
+        logger.info(f"Updating streaming pipeline with {len(df)} new articles")
+
+        transformer = StreamingDataTransformation.from_pipeline(load_object(pipeline_path))
+        df = df.dropna(subset=["text"])
+        pipeline = transformer.partial_fit(df["text"], df["label"])
+
+        ModelTrainer(pipeline=pipeline).save_pipeline(pipeline_path)
+        return pipeline
+
+    except Exception as e:
+        logger.error("Streaming pipeline update failed")
+        raise CustomException(e)
+
+
 if __name__ == "__main__":
-    run_training_pipeline()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake news training pipeline")
+    parser.add_argument("mode", nargs="?", default="batch", choices=["batch", "streaming"])
+    parser.add_argument("--force", nargs="*", default=[],
+                        help="Stage names to re-run even if up to date (e.g. ingestion)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Trace peak memory and write a cProfile dump per stage to logs/profiles/")
+    args = parser.parse_args()
+
+    run_training_pipeline(mode=args.mode, force=args.force, profile=args.profile)
\ No newline at end of file
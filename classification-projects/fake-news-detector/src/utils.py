@@ -1,5 +1,6 @@
 import os
 import pickle
+import hashlib
 from src.exception import CustomException
 from src.logger import get_logger
 
@@ -35,3 +36,18 @@ def load_object(file_path):
 def ensure_directory(path: str):
     os.makedirs(path, exist_ok=True)
     logger.info(f"Directory ensured: {path}")
+
+
+def file_sha256(file_path, block_size=1 << 20):
+    """
+    Content hash of a file, read in blocks so large datasets are not loaded at once
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    except Exception as e:
+        raise CustomException(e)
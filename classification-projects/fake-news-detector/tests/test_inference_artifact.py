@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from src.components.inference_artifact import FastScorer, export_inference_artifact
+
+TEXTS = [
+    "government officials confirmed the budget figures in parliament today",
+    "shocking secret cure doctors do not want you to know about",
+    "the central bank left interest rates unchanged on thursday",
+    "aliens built the pyramids and the media is hiding the truth",
+    "parliament approved the new budget after a long debate",
+    "miracle pill melts fat overnight says secret insider",
+]
+LABELS = [1, 0, 1, 0, 1, 0]
+
+
+@pytest.mark.parametrize("classifier", [
+    LogisticRegression(),
+    SGDClassifier(loss="log_loss", random_state=42),
+    SGDClassifier(loss="modified_huber", random_state=42),
+])
+def test_fast_scorer_matches_pipeline(tmp_path, classifier):
+    pipeline = Pipeline([("tfidf", TfidfVectorizer(ngram_range=(1, 2))), ("classifier", classifier)])
+    pipeline.fit(TEXTS, LABELS)
+
+    scorer = FastScorer(export_inference_artifact(pipeline, tmp_path / "inference"))
+    labels, probs = scorer.score(TEXTS)
+
+    np.testing.assert_array_equal(labels, pipeline.predict(TEXTS))
+    np.testing.assert_allclose(probs, pipeline.predict_proba(TEXTS))
@@ -0,0 +1,27 @@
+import numpy as np
+from src.components.streaming_transformation import StreamingDataTransformation
+from src.pipeline.predict_pipeline import Predictor
+from src.utils import save_object
+
+TEXTS = [
+    "government officials confirmed the budget figures in parliament today",
+    "shocking secret cure doctors do not want you to know about",
+    "the central bank left interest rates unchanged on thursday",
+    "aliens built the pyramids and the media is hiding the truth",
+]
+LABELS = [1, 0, 1, 0]
+
+
+def test_explain_hashing_pipeline(tmp_path):
+    transformer = StreamingDataTransformation(n_features=2**10)
+    pipeline = transformer.partial_fit(TEXTS, LABELS)
+    path = tmp_path / "streaming_pipeline.pkl"
+    save_object(str(path), pipeline)
+
+    predictor = Predictor(str(path))
+    preds, probs, explanations = predictor.predict_with_explanation(TEXTS, top_n=5)
+
+    np.testing.assert_array_equal(preds, pipeline.predict(TEXTS))
+    np.testing.assert_allclose(probs, pipeline.predict_proba(TEXTS))
+    assert explanations == [[] for _ in TEXTS]
+    assert predictor._warned_no_explain
@@ -0,0 +1,29 @@
+import numpy as np
+from src.pipeline.prediction_cache import PredictionCache
+
+
+class CountingPredictor:
+    def __init__(self):
+        self.calls = []
+
+    def predict_with_proba(self, texts):
+        self.calls.append(list(texts))
+        probs = np.array([[0.25, 0.75] if "bank" in t else [0.9, 0.1] for t in texts])
+        return (probs[:, 1] > 0.5).astype(int), probs
+
+
+def test_duplicate_texts_scored_once(tmp_path):
+    cache = PredictionCache(tmp_path / "model.pkl")
+    predictor = CountingPredictor()
+    texts = ["The central bank held rates.", "Aliens built the pyramids!",
+             "The central bank held rates.", "the central bank held rates"]
+
+    results = cache.predict(predictor, texts)
+
+    assert len(predictor.calls) == 1 and len(predictor.calls[0]) == 2
+    assert results[0] == results[2] == results[3] == (1, [0.25, 0.75], [])
+    assert results[1] == (0, [0.9, 0.1], [])
+    assert cache.stats()["entries"] == 2
+
+    assert cache.predict(predictor, texts) == results
+    assert len(predictor.calls) == 1
@@ -1,16 +1,60 @@
 import streamlit as st
 import pandas as pd
 import datetime
-from db.mongo import policies_col, claims_col, events_col, vehicles_col
-from utils.fraud import compute_fraud_score
+import time
+from db.mongo import claims_col, events_col
+from db.indexes import ensure_indexes
+from db.counters import IdAllocator, sync_counter
+from utils.reference_cache import ReferenceCache
+from utils.claims_view import VIEW_FIELDS, SORT_FIELDS, build_claims_filter, fetch_claims_page
+from utils.scoring_queue import ScoringWorker, enqueue_claim, get_scoring_result, PENDING, SCORING, SCORED
 
-import joblib
+POLL_TIMEOUT = 30  # seconds the Submit tab keeps polling for a score
 
-from scripts.train_ml_model import extract_features
+st.set_page_config(page_title="Insurance Fraud System", layout="wide")
 
-ml_model = joblib.load("models/fraud_model.pkl")
 
-st.set_page_config(page_title="Insurance Fraud System", layout="wide")
+@st.cache_resource
+def bootstrap_indexes():
+    # Runs once per server process; create_index is a no-op for existing indexes
+    return ensure_indexes()
+
+
+bootstrap_indexes()
+
+
+@st.cache_resource
+def get_reference_cache():
+    # Shared across reruns and sessions; invalidated by TTL and reference_data versions
+    return ReferenceCache(ttl=300)
+
+
+reference = get_reference_cache()
+
+
+@st.cache_resource
+def get_claim_id_allocator():
+    # Start the counter above any claim IDs created before it existed
+    sync_counter("claims", claims_col, "CLM")
+    return IdAllocator("claims", "CLM")
+
+
+claim_ids = get_claim_id_allocator()
+
+
+@st.cache_resource
+def get_scoring_worker():
+    # One background worker per server process; more can run with `python -m utils.scoring_queue`
+    return ScoringWorker(reference=reference).start()
+
+
+scoring_worker = get_scoring_worker()
+
+
+@st.cache_data(ttl=60)
+def get_claim_statuses():
+    # distinct is served from the status index
+    return sorted(claims_col.distinct("status"))
 
 st.title("Vehicle Insurance Fraud System")
 
@@ -22,8 +66,7 @@ selected_tab = st.sidebar.radio("Select Tab", tabs)
 if selected_tab == "Submit Claim":
     st.header("Submit a New Claim")
 
-    policies = list(policies_col.find({}))
-    policy_options = {p["_id"]: f"{p['_id']} - {p['coverage_type']}" for p in policies}
+    policy_options = reference.policy_options()
 
     selected_policy_id = st.selectbox("Select Policy", options=list(policy_options.keys()),
                                       format_func=lambda x: policy_options[x])
@@ -40,11 +83,10 @@ if selected_tab == "Submit Claim":
     repair_shop = st.text_input("Repair Shop", value="QuickFix Garage")
 
     if st.button("Submit Claim"):
-        # Generate claim ID
-        existing_claims = claims_col.count_documents({})
-        claim_id = f"CLM{str(existing_claims+1).zfill(4)}"
+        # Generate claim ID (atomic counter, no collection count)
+        claim_id = claim_ids.next_id()
 
-        # Insert claim document
+        # Insert claim document; rule + ML scoring runs in the background worker
         claim_doc = {
             "_id": claim_id,
             "policy_id": selected_policy_id,
@@ -53,13 +95,14 @@ if selected_tab == "Submit Claim":
             "submitted_at": datetime.datetime.combine(accident_date, datetime.datetime.now().time()),
             "status": "under_review"
         }
-        claims_col.insert_one(claim_doc)
+        enqueue_claim(claim_doc)
 
         # Insert claim_submitted event
         event_doc = {
             "claim_id": claim_id,
             "event_type": "claim_submitted",
             "timestamp": claim_doc["submitted_at"],
+            "ingested_at": datetime.datetime.now(),
             "metadata": {
                 "location": location,
                 "accident_type": claim_type,
@@ -67,40 +110,64 @@ if selected_tab == "Submit Claim":
             }
         }
         events_col.insert_one(event_doc)
+        scoring_worker.notify()
+
+        st.session_state.last_claim = (claim_id, time.monotonic())
+
+    # Poll the last submitted claim until the worker has scored it
+    if "last_claim" in st.session_state:
+        claim_id, submitted = st.session_state.last_claim
+        result = get_scoring_result(claim_id) or {}
+        status = result.get("scoring_status")
+
+        if status == SCORED:
+            st.success(f"Claim {claim_id} submitted successfully! Fraud Score: {result['fraud_score']}")
+        elif status in (PENDING, SCORING) and time.monotonic() - submitted < POLL_TIMEOUT:
+            st.info(f"Claim {claim_id} submitted, scoring in progress...")
+            time.sleep(0.5)
+            st.rerun()
+        elif status in (PENDING, SCORING):
+            st.warning(f"Claim {claim_id} submitted; its fraud score is not ready yet.")
+            if st.button("Refresh Score"):
+                st.session_state.last_claim = (claim_id, time.monotonic())
+                st.rerun()
+        else:
+            st.error(f"Claim {claim_id} could not be scored: {result.get('scoring_error', 'unknown error')}")
 
-        # Rule-based score
-        rule_score = compute_fraud_score(claim_doc)
 
-        # ML-based score (Isolation Forest outputs -1 for outlier, 1 for normal)
-        features = extract_features(claim_doc)
-        ml_pred = ml_model.predict(features)[0]  # -1 = fraud, 1 = normal
-        ml_score = 50 if ml_pred == -1 else 0  # Scale ML score 0-50
+# View Claims Tab
+elif selected_tab == "View Claims":
+    st.header("All Claims")
 
-        # Hybrid score: rule-based (0-50) + ML-based (0-50)
-        fraud_score = min(rule_score + ml_score, 100)
+    # Filters and sorting run server-side; only one page is fetched per rerun
+    col1, col2, col3 = st.columns(3)
+    min_fraud_score = col1.slider("Minimum Fraud Score", 0, 100, 0, step=10)
+    statuses = col2.multiselect("Status", options=get_claim_statuses())
+    date_range = col3.date_input("Submitted Between", value=())
 
-        # Update claim document
-        claims_col.update_one({"_id": claim_id}, {"$set": {
-            "rule_score": rule_score,
-            "ml_score": ml_score,
-            "fraud_score": fraud_score
-        }})
+    col4, col5, col6 = st.columns(3)
+    sort_field = col4.selectbox("Sort By", SORT_FIELDS)
+    descending = col5.radio("Order", ["Descending", "Ascending"], horizontal=True) == "Descending"
+    page_size = col6.selectbox("Rows per Page", [25, 50, 100], index=1)
 
-        st.success(f"Claim {claim_id} submitted successfully! Fraud Score: {fraud_score}")
+    start_date = date_range[0] if len(date_range) > 0 else None
+    end_date = date_range[1] if len(date_range) > 1 else start_date
+    query = build_claims_filter(min_fraud_score, statuses, start_date, end_date)
 
+    # Keyset cursors of the pages visited so far; reset when the view changes
+    view_key = (str(query), sort_field, descending, page_size)
+    if st.session_state.get("claims_view_key") != view_key:
+        st.session_state.claims_view_key = view_key
+        st.session_state.claims_cursors = [None]
+    cursors = st.session_state.claims_cursors
 
-# View Claims Tab
-elif selected_tab == "View Claims":
-    st.header("All Claims")
+    claims, next_cursor = fetch_claims_page(query, sort_field, descending, page_size, after=cursors[-1])
 
-    claims = list(claims_col.find({}))
     if claims:
-        # Converting to pandas DataFrame for easy display
-        df = pd.DataFrame(claims)
+        df = pd.DataFrame(claims).reindex(columns=VIEW_FIELDS)
         df["submitted_at"] = df["submitted_at"].dt.strftime("%Y-%m-%d %H:%M:%S")
-        df["fraud_score"] = df.get("fraud_score", 0)
-        df["rule_score"] = df.get("rule_score", 0)
-        df["ml_score"] = df.get("ml_score", 0)
+        # Claims still in the scoring queue (or failed) have no scores yet; they stay blank
+        df["scoring_status"] = df["scoring_status"].fillna(SCORED)
 
         # Highlight high-risk claims
         def highlight_risk(row):
@@ -108,9 +175,16 @@ elif selected_tab == "View Claims":
                 return ["background-color: #FFCCCC"]*len(row)
             return [""]*len(row)
 
-        st.dataframe(df[["_id", "policy_id", "claim_type", "claim_amount",
-                         "submitted_at", "status", "rule_score", "ml_score", "fraud_score"]]
-                    .style.apply(highlight_risk, axis=1))
+        st.dataframe(df.style.apply(highlight_risk, axis=1))
+
+        nav1, nav2, nav3 = st.columns([1, 1, 4])
+        if nav1.button("Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+        if nav2.button("Next", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+        nav3.caption(f"Page {len(cursors)}")
 
         st.subheader("View Claim Events")
         selected_claim_id = st.selectbox("Select Claim ID", options=df["_id"])
@@ -0,0 +1,131 @@
+"""
+Index declarations for the fraud system's hot queries, an idempotent bootstrap
+and a query-plan check that fails if any hot query falls back to a COLLSCAN.
+
+Usage:
+    python -m db.indexes            # create indexes
+    python -m db.indexes --check    # create indexes, then verify query plans
+"""
+
+import sys
+import datetime
+from pymongo import ASCENDING, DESCENDING
+from db.mongo import db
+
+# collection -> list of (keys, options)
+INDEXES = {
+    "claims": [
+        # Recent claims per policy in a submitted_at window (rules + ML features)
+        ([("policy_id", ASCENDING), ("submitted_at", ASCENDING)], {"name": "policy_submitted_at"}),
+        # View Claims keyset pagination: sort field + _id tiebreaker, optionally filtered by status
+        ([("submitted_at", DESCENDING), ("_id", DESCENDING)], {"name": "submitted_at_id"}),
+        ([("fraud_score", DESCENDING), ("_id", DESCENDING)], {"name": "fraud_score_id"}),
+        ([("claim_amount", DESCENDING), ("_id", DESCENDING)], {"name": "claim_amount_id"}),
+        ([("status", ASCENDING), ("submitted_at", DESCENDING), ("_id", DESCENDING)],
+         {"name": "status_submitted_at_id"}),
+        # Scoring queue: pending claims in queue order (prefix also serves the stale-lease scan)
+        ([("scoring_status", ASCENDING), ("ingested_at", ASCENDING)], {"name": "scoring_status_ingested_at"}),
+        # Incremental retraining: claims inserted since the last run
+        ([("ingested_at", ASCENDING)], {"name": "ingested_at"}),
+    ],
+    "claim_events": [
+        # Repair estimate / event timeline lookups per claim
+        ([("claim_id", ASCENDING), ("event_type", ASCENDING)], {"name": "claim_event_type"}),
+        # Shop graph: repair estimates inserted since the last update
+        ([("event_type", ASCENDING), ("ingested_at", ASCENDING)], {"name": "event_type_ingested_at"}),
+    ],
+}
+
+
+def ensure_indexes(database=None):
+    """
+    Create all declared indexes (no-op for indexes that already exist)
+    Returns: list of (collection, index name)
+    """
+    database = db if database is None else database
+    created = []
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            name = database[collection].create_index(keys, **options)
+            created.append((collection, name))
+    return created
+
+
+def hot_queries(database=None):
+    """
+    Representative filters for the hot access patterns, built from a sample claim
+    """
+    database = db if database is None else database
+    claim = database["claims"].find_one({}, {"policy_id": 1, "submitted_at": 1}) or {
+        "_id": "CLM0001", "policy_id": "POL001", "submitted_at": datetime.datetime.now()
+    }
+    start_window = claim["submitted_at"] - datetime.timedelta(days=30)
+
+    return [
+        ("claims", "recent claims per policy", {
+            "policy_id": claim["policy_id"],
+            "submitted_at": {"$gte": start_window, "$lt": claim["submitted_at"]}
+        }),
+        ("claim_events", "repair estimate per claim", {
+            "claim_id": claim["_id"], "event_type": "repair_estimate_added"
+        }),
+        ("claim_events", "events per claim", {"claim_id": claim["_id"]}),
+        ("claim_events", "repair estimates ingested since the last graph update", {
+            "event_type": "repair_estimate_added",
+            "ingested_at": {"$gt": datetime.datetime.now() - datetime.timedelta(days=1)}
+        }),
+        ("claims", "high-risk claims page", {"fraud_score": {"$gte": 60}}),
+        ("claims", "claims by status", {"status": "under_review"}),
+        ("claims", "pending scoring queue", {"scoring_status": "pending"}),
+        ("claims", "claims ingested since the last training run", {
+            "ingested_at": {"$gt": datetime.datetime.now() - datetime.timedelta(days=1)}
+        }),
+    ]
+
+
+def _plan_stages(plan):
+    """
+    All stage names in an explain() plan tree (handles nested / sharded plans)
+    """
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(_plan_stages(item))
+    return stages
+
+
+def check_query_plans(database=None):
+    """
+    Explain every hot query and report whether its winning plan uses a COLLSCAN
+    Returns: list of dicts (collection, query, stages, collscan)
+    """
+    database = db if database is None else database
+    report = []
+    for collection, description, query in hot_queries(database):
+        explain = database[collection].find(query).explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))
+        report.append({
+            "collection": collection,
+            "query": description,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    for collection, name in ensure_indexes():
+        print(f"Index ready: {collection}.{name}")
+
+    if "--check" in sys.argv:
+        report = check_query_plans()
+        for row in report:
+            status = "COLLSCAN" if row["collscan"] else "ok"
+            print(f"[{status}] {row['collection']}: {row['query']} -> {' > '.join(row['stages'])}")
+        if any(row["collscan"] for row in report):
+            sys.exit(1)
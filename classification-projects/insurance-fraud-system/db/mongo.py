@@ -15,4 +15,7 @@ policies_col = db["policies"]
 policyholders_col = db["policyholders"]
 vehicles_col = db["vehicles"]
 claims_col = db["claims"]
-events_col = db["claim_events"]
\ No newline at end of file
+events_col = db["claim_events"]
+reference_col = db["reference_data"]
+counters_col = db["counters"]
+shop_edges_col = db["shop_graph_edges"]
@@ -2,6 +2,12 @@
 Generates synthetic insurance data and inserts into MongoDB.
 Collections - policyholders, vehicles, policies, claims, claim_events
 Simulates Normal vs fraudulent claims and Collusion patterns (e.g., same repair shop in suspicious claims)
+
+Documents are built in memory in batches with NumPy, rule scores are computed
+with the vectorized rule engine and everything is written with chunked
+insert_many(ordered=False), so millions of claims can be generated for load tests:
+
+    python scripts/seed_data.py --claims 1000000 --policies 200000
 """
 
 import sys
@@ -11,165 +17,266 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
-import random
+import argparse
+import time
 import datetime
+import numpy as np
+import pandas as pd
 from faker import Faker
-from db.mongo import policyholders_col, vehicles_col, policies_col, claims_col, events_col
-from utils.fraud import compute_fraud_score
+from db.mongo import policyholders_col, vehicles_col, policies_col, claims_col, events_col, shop_edges_col, reference_col
+from db.indexes import ensure_indexes
+from db.counters import IdAllocator
+from utils.features import recent_claim_counts
+from utils.rules import evaluate_rules
+from utils.reference_cache import bump_reference_version, RISKY_SHOPS_ID, SHOP_RISK_ID
+from utils.shop_graph import GRAPH_STATE_ID
 
 fake = Faker()
-random.seed(42)
+Faker.seed(42)
+rng = np.random.default_rng(42)
 
 NUM_POLICYHOLDERS = 50
 NUM_VEHICLES = 50
 NUM_POLICIES = 50
 NUM_CLAIMS = 100
+BATCH_SIZE = 10_000
 
 FRAUD_PERCENTAGE = 0.1  # 10% of claims will be fraudulent
 
+MAKES = ["Toyota", "Honda", "Nissan", "Subaru", "Ford"]
+MODELS = ["Axio", "Fit", "Leaf", "Impreza", "Focus"]
+COVERAGE_TYPES = ["Comprehensive", "Third Party", "Third Party Fire & Theft"]
+CLAIM_TYPES = ["Accident", "Theft", "Fire"]
+REPAIR_SHOPS = ["QuickFix Garage", "SuperRepair Ltd", "FastTrack Auto", "Trusted Repairs"]
+COLLUSION_SHOP = "QuickFix Garage"
+
+POLICY_START = datetime.datetime(2023, 1, 1)
+DATA_END = datetime.datetime(2025, 1, 1)
+
+# Faker is slow per call, so names, contacts and cities are sampled from fixed pools
+POOL_SIZE = 1000
+
 
 # Helper Functions
-def random_date(start, end):
-    """Return a random datetime between two datetime objects"""
-    return start + datetime.timedelta(
-        seconds=random.randint(0, int((end - start).total_seconds()))
-    )
-
-def insert_policyholder(ph_id):
-    ph = {
-        "_id": ph_id,
-        "name": fake.name(),
-        "phone": fake.phone_number(),
-        "email": fake.email(),
-        "risk_profile": "normal",
-        "created_at": datetime.datetime.now()
-    }
-    policyholders_col.insert_one(ph)
-    return ph
-
-def insert_vehicle(vh_id):
-    makes = ["Toyota", "Honda", "Nissan", "Subaru", "Ford"]
-    models = ["Axio", "Fit", "Leaf", "Impreza", "Focus"]
-    year = random.randint(2010, 2024)
-    vh = {
-        "_id": vh_id,
-        "registration": fake.bothify(text="K??###A"),
-        "make": random.choice(makes),
-        "model": random.choice(models),
-        "year": year,
-        "estimated_value": random.randint(500000, 2000000)
-    }
-    vehicles_col.insert_one(vh)
-    return vh
-
-def insert_policy(policy_id, ph, vh):
-    start_date = random_date(datetime.datetime(2023, 1, 1), datetime.datetime(2025, 1, 1))
-    coverage_types = ["Comprehensive", "Third Party", "Third Party Fire & Theft"]
-    pol = {
-        "_id": policy_id,
-        "policyholder_id": ph["_id"],
-        "vehicle_id": vh["_id"],
-        "coverage_type": random.choice(coverage_types),
-        "start_date": start_date,
-        "status": "active",
-        "premium": random.randint(20000, 50000)
-    }
-    policies_col.insert_one(pol)
-    return pol
-
-# Insert Claim + Events
-def insert_claim(claim_id, policy, fraud=False):
-    claim_amount = int(policy["premium"] * random.randint(10, 50))
-    if fraud:
-        claim_amount *= random.uniform(1.5, 3)
-
-    claim = {
-        "_id": claim_id,
-        "policy_id": policy["_id"],
-        "claim_amount": int(claim_amount),
-        "claim_type": random.choice(["Accident", "Theft", "Fire"]),
-        "submitted_at": random_date(policy["start_date"], datetime.datetime(2025, 1, 1)),
-        "status": "under_review"
-    }
-    claims_col.insert_one(claim)
-
-    # Create claim events
-    events = []
-
-    events.append({
-        "claim_id": claim_id,
-        "event_type": "claim_submitted",
-        "timestamp": claim["submitted_at"],
-        "metadata": {
-            "location": fake.city(),
-            "accident_type": claim["claim_type"]
-        }
+def make_ids(prefix, n, width=3):
+    return [f"{prefix}{str(i + 1).zfill(width)}" for i in range(n)]
+
+
+def random_datetimes(start, end):
+    """
+    Random datetimes between start and end (arrays of numpy datetime64, same length),
+    truncated to milliseconds like MongoDB stores them
+    """
+    start = np.asarray(start, dtype="datetime64[ms]")
+    end = np.asarray(end, dtype="datetime64[ms]")
+    span = (end - start).astype(np.int64)
+    return start + (rng.random(len(span)) * (span + 1)).astype(np.int64).astype("timedelta64[ms]")
+
+
+def to_python(values):
+    """
+    NumPy datetimes -> datetime.datetime for BSON
+    """
+    return pd.DatetimeIndex(values).to_pydatetime()
+
+
+def insert_in_chunks(collection, docs, chunk_size=BATCH_SIZE):
+    for start in range(0, len(docs), chunk_size):
+        collection.insert_many(docs[start:start + chunk_size], ordered=False)
+
+
+def generate_policyholders(n, batch_size=BATCH_SIZE):
+    names = [fake.name() for _ in range(POOL_SIZE)]
+    phones = [fake.phone_number() for _ in range(POOL_SIZE)]
+    emails = [fake.email() for _ in range(POOL_SIZE)]
+    now = datetime.datetime.now()
+
+    ids = make_ids("PH", n)
+    for start in range(0, n, batch_size):
+        picks = rng.integers(0, POOL_SIZE, size=(min(batch_size, n - start), 3))
+        insert_in_chunks(policyholders_col, [{
+            "_id": ph_id,
+            "name": names[a],
+            "phone": phones[b],
+            "email": emails[c],
+            "risk_profile": "normal",
+            "created_at": now
+        } for ph_id, (a, b, c) in zip(ids[start:start + batch_size], picks)])
+    return ids
+
+
+def generate_vehicles(n, batch_size=BATCH_SIZE):
+    ids = make_ids("VH", n)
+    values = rng.integers(500000, 2000001, size=n)
+    letters = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+    for start in range(0, n, batch_size):
+        end = min(start + batch_size, n)
+        size = end - start
+        makes = rng.integers(0, len(MAKES), size)
+        models = rng.integers(0, len(MODELS), size)
+        years = rng.integers(2010, 2025, size)
+        plates = rng.choice(letters, size=(size, 2))
+        digits = rng.integers(0, 1000, size)
+        insert_in_chunks(vehicles_col, [{
+            "_id": ids[start + i],
+            "registration": f"K{plates[i, 0]}{plates[i, 1]}{digits[i]:03d}A",
+            "make": MAKES[makes[i]],
+            "model": MODELS[models[i]],
+            "year": int(years[i]),
+            "estimated_value": int(values[start + i])
+        } for i in range(size)])
+
+    return pd.DataFrame({"vehicle_id": ids, "estimated_value": values})
+
+
+def generate_policies(n, policyholder_ids, vehicles, batch_size=BATCH_SIZE):
+    policies = pd.DataFrame({
+        "policy_id": make_ids("POL", n),
+        "policyholder_id": np.array(policyholder_ids)[rng.integers(0, len(policyholder_ids), n)],
+        "vehicle_idx": rng.integers(0, len(vehicles), n),
+        "coverage_type": np.array(COVERAGE_TYPES)[rng.integers(0, len(COVERAGE_TYPES), n)],
+        "start_date": random_datetimes(np.full(n, POLICY_START), np.full(n, DATA_END)),
+        "premium": rng.integers(20000, 50001, n),
     })
+    policies["vehicle_id"] = vehicles["vehicle_id"].to_numpy()[policies["vehicle_idx"]]
+    policies["estimated_value"] = vehicles["estimated_value"].to_numpy()[policies["vehicle_idx"]]
+
+    for start in range(0, n, batch_size):
+        batch = policies.iloc[start:start + batch_size]
+        insert_in_chunks(policies_col, [{
+            "_id": row.policy_id,
+            "policyholder_id": row.policyholder_id,
+            "vehicle_id": row.vehicle_id,
+            "coverage_type": row.coverage_type,
+            "start_date": start_date,
+            "status": "active",
+            "premium": int(row.premium)
+        } for row, start_date in zip(batch.itertuples(), to_python(batch["start_date"]))])
+
+    return policies
+
+
+def generate_claims(n, policies, batch_size=BATCH_SIZE):
+    """
+    Claims and their events. Claim-level arrays for all n claims are drawn up front
+    (needed for the 30-day recent-claim windows); documents are built and inserted per batch.
+    """
+    policy_idx = rng.integers(0, len(policies), n)
+    fraud = rng.random(n) < FRAUD_PERCENTAGE
+    premium = policies["premium"].to_numpy()[policy_idx]
+    start_date = policies["start_date"].to_numpy()[policy_idx]
 
-    repair_shops = ["QuickFix Garage", "SuperRepair Ltd", "FastTrack Auto", "Trusted Repairs"]
-    repair_shop = random.choice(repair_shops)
-    if fraud:
-        repair_shop = "QuickFix Garage"  # collusion pattern
-
-    estimate_date = claim["submitted_at"] + datetime.timedelta(days=random.randint(1, 5))
-    events.append({
-        "claim_id": claim_id,
-        "event_type": "repair_estimate_added",
-        "timestamp": estimate_date,
-        "metadata": {
-            "repair_shop": repair_shop,
-            "estimated_cost": claim["claim_amount"] * random.uniform(0.8, 1.1)
-        }
+    claim_amount = (premium * rng.integers(10, 51, n)).astype(float)
+    claim_amount[fraud] *= rng.uniform(1.5, 3, fraud.sum())
+    claim_amount = claim_amount.astype(np.int64)
+
+    claims = pd.DataFrame({
+        "claim_id": IdAllocator("claims", "CLM").allocate(n),
+        "policy_id": policies["policy_id"].to_numpy()[policy_idx],
+        "claim_amount": claim_amount,
+        "claim_type": np.array(CLAIM_TYPES)[rng.integers(0, len(CLAIM_TYPES), n)],
+        "submitted_at": random_datetimes(start_date, np.full(n, DATA_END)),
+        "repair_shop": np.where(fraud, COLLUSION_SHOP,
+                                np.array(REPAIR_SHOPS)[rng.integers(0, len(REPAIR_SHOPS), n)]),
+        "estimate_delay_days": rng.integers(1, 6, n),
+        "estimate_factor": rng.uniform(0.8, 1.1, n),
+    })
+
+    # Rule scores for every claim in one pass
+    features = pd.DataFrame({
+        "amount_ratio": claim_amount / policies["estimated_value"].to_numpy()[policy_idx],
+        "days_since_start": (claims["submitted_at"] - pd.Series(start_date)).dt.days,
+        "recent_claim_count": recent_claim_counts(claims, claims[["policy_id", "submitted_at"]]),
+        "repair_shop": claims["repair_shop"],
     })
+    claims["rule_score"], _ = evaluate_rules(features)
+
+    cities = [fake.city() for _ in range(POOL_SIZE)]
+    started = time.perf_counter()
+    ingested_at = datetime.datetime.now()
 
-    events_col.insert_many(events)
+    for start in range(0, n, batch_size):
+        batch = claims.iloc[start:start + batch_size]
+        submitted = to_python(batch["submitted_at"])
+        estimated = to_python(batch["submitted_at"] + pd.to_timedelta(batch["estimate_delay_days"], unit="D"))
+        locations = rng.integers(0, POOL_SIZE, len(batch))
 
-    # Compute rule-based fraud score
-    rule_score = compute_fraud_score(claim)
-    ml_score = 0
-    fraud_score = rule_score
+        claim_docs, event_docs = [], []
+        for row, submitted_at, estimate_date, location in zip(batch.itertuples(), submitted, estimated, locations):
+            claim_docs.append({
+                "_id": row.claim_id,
+                "policy_id": row.policy_id,
+                "claim_amount": int(row.claim_amount),
+                "claim_type": row.claim_type,
+                "submitted_at": submitted_at,
+                "ingested_at": ingested_at,
+                "status": "under_review",
+                "rule_score": int(row.rule_score),
+                "ml_score": 0,
+                "fraud_score": int(row.rule_score)
+            })
+            event_docs.append({
+                "claim_id": row.claim_id,
+                "event_type": "claim_submitted",
+                "timestamp": submitted_at,
+                "ingested_at": ingested_at,
+                "metadata": {"location": cities[location], "accident_type": row.claim_type}
+            })
+            event_docs.append({
+                "claim_id": row.claim_id,
+                "event_type": "repair_estimate_added",
+                "timestamp": estimate_date,
+                "ingested_at": ingested_at,
+                "metadata": {
+                    "repair_shop": row.repair_shop,
+                    "estimated_cost": float(row.claim_amount * row.estimate_factor)
+                }
+            })
 
-    claims_col.update_one(
-        {"_id": claim["_id"]},
-        {"$set": {
-            "rule_score": rule_score,
-            "ml_score": ml_score,
-            "fraud_score": fraud_score
-        }}
-    )
+        insert_in_chunks(claims_col, claim_docs)
+        insert_in_chunks(events_col, event_docs)
 
-    return claim
+        done = start + len(batch)
+        rate = done / max(time.perf_counter() - started, 1e-9)
+        print(f"Inserted {done}/{n} claims ({rate:,.0f} claims/s)")
 
 
 # Main Loop
-def generate_data():
+def generate_data(num_policyholders=NUM_POLICYHOLDERS, num_vehicles=NUM_VEHICLES,
+                  num_policies=NUM_POLICIES, num_claims=NUM_CLAIMS, batch_size=BATCH_SIZE):
     # Clear collections
     policyholders_col.delete_many({})
     vehicles_col.delete_many({})
     policies_col.delete_many({})
     claims_col.delete_many({})
     events_col.delete_many({})
+    shop_edges_col.delete_many({})
+    # The shop graph and everything published from it describe the old claims
+    reference_col.delete_many({"_id": {"$in": [GRAPH_STATE_ID, SHOP_RISK_ID, RISKY_SHOPS_ID]}})
+    # The claim counter is not reset: a running app may still hold a reserved block of it
 
-    # Generate policyholders
-    policyholders = [insert_policyholder(f"PH{str(i+1).zfill(3)}") for i in range(NUM_POLICYHOLDERS)]
+    policyholder_ids = generate_policyholders(num_policyholders, batch_size)
+    vehicles = generate_vehicles(num_vehicles, batch_size)
+    policies = generate_policies(num_policies, policyholder_ids, vehicles, batch_size)
+    generate_claims(num_claims, policies, batch_size)
 
-    # Generate vehicles
-    vehicles = [insert_vehicle(f"VH{str(i+1).zfill(3)}") for i in range(NUM_VEHICLES)]
+    # Building indexes once after the bulk load is cheaper than maintaining them per insert
+    ensure_indexes()
 
-    # Generate policies
-    policies = []
-    for i in range(NUM_POLICIES):
-        ph = random.choice(policyholders)
-        vh = random.choice(vehicles)
-        policies.append(insert_policy(f"POL{str(i+1).zfill(3)}", ph, vh))
-
-    # Generate claims
-    for i in range(NUM_CLAIMS):
-        policy = random.choice(policies)
-        fraud_flag = random.random() < FRAUD_PERCENTAGE
-        insert_claim(f"CLM{str(i+1).zfill(4)}", policy, fraud=fraud_flag)
+    # Policies and the risky-shop list were replaced: drop cached reference data in running apps
+    bump_reference_version("policies", "risky_shops")
 
     print("Data generation complete!")
 
+
 if __name__ == "__main__":
-    generate_data()
+    parser = argparse.ArgumentParser(description="Generate synthetic insurance data")
+    parser.add_argument("--policyholders", type=int, default=NUM_POLICYHOLDERS)
+    parser.add_argument("--vehicles", type=int, default=NUM_VEHICLES)
+    parser.add_argument("--policies", type=int, default=NUM_POLICIES)
+    parser.add_argument("--claims", type=int, default=NUM_CLAIMS)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    generate_data(args.policyholders, args.vehicles, args.policies, args.claims, args.batch_size)
@@ -1,72 +1,180 @@
+"""
+Trains the Isolation Forest and rescores claims.
+
+    python scripts/train_ml_model.py                # full retrain + rescore all claims
+    python scripts/train_ml_model.py --incremental  # retrain on a reservoir sample + new claims,
+                                                    # rescore only claims whose features changed
+
+New claims are found by ingested_at (insertion time); submitted_at is the
+user-entered accident date and is only used for the 30-day window.
+"""
+
 import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
+import argparse
+import json
+import datetime
 from sklearn.ensemble import IsolationForest
 import numpy as np
 import joblib
 from db.mongo import claims_col
+from utils.features import FEATURE_COLUMNS, build_feature_frame, build_feature_matrix, RECENT_WINDOW_DAYS
+from utils.reference_cache import load_risky_shops
+from utils.rules import DEFAULT_RULES, evaluate_rules, with_risky_shops
+from utils.scoring import rescore_claims
+
+MODEL_PATH = "models/fraud_model.pkl"
+STATE_PATH = "models/training_state.json"
+RESERVOIR_PATH = "models/reservoir.npy"
+RESERVOIR_SIZE = 50_000
+# Claims ingested in the last seconds before a run are left for the next one,
+# so inserts still in flight (or from a slightly skewed clock) are not skipped
+INGEST_GRACE_SECONDS = 60
+
+rng = np.random.default_rng(42)
+
+
+def train_model(X):
+    """
+    Fit the Isolation Forest on a feature matrix
+    """
+    clf = IsolationForest(n_estimators=100, contamination=0.1, random_state=42)
+    clf.fit(X)
+    return clf
 
-import numpy as np
-import datetime
-from db.mongo import claims_col, policies_col, vehicles_col, events_col
 
-def extract_features(claim):
+def update_reservoir(reservoir, n_seen, X_new, size=RESERVOIR_SIZE):
     """
-    Create a feature vector for ML model
+    Reservoir sampling (Algorithm R): keeps a uniform sample of at most `size`
+    rows over every row seen so far
+    Returns: (reservoir, n_seen)
     """
-    # Fetch policy and vehicle
-    policy = policies_col.find_one({"_id": claim["policy_id"]})
-    vehicle = vehicles_col.find_one({"_id": policy["vehicle_id"]})
+    reservoir = X_new[:0].copy() if reservoir is None else reservoir
+    n_fill = max(0, min(size - len(reservoir), len(X_new)))
+    reservoir = np.vstack([reservoir, X_new[:n_fill]])
+
+    # Row i of X_new is the (n_seen + i)-th row overall; it replaces a random slot with prob size / (t + 1)
+    t = n_seen + np.arange(n_fill, len(X_new))
+    slots = (rng.random(len(t)) * (t + 1)).astype(np.int64)
+    for row, slot in zip(X_new[n_fill:][slots < size], slots[slots < size]):
+        reservoir[slot] = row
+
+    return reservoir, n_seen + len(X_new)
+
 
-    # Days since policy start
-    days_since_start = (claim["submitted_at"] - policy["start_date"]).days
+def load_state():
+    if not Path(STATE_PATH).exists() or not Path(RESERVOIR_PATH).exists():
+        return None
+    with open(STATE_PATH) as f:
+        state = json.load(f)
+    state["high_water_mark"] = datetime.datetime.fromisoformat(state["high_water_mark"])
+    return state, np.load(RESERVOIR_PATH)
 
-    # Claim amount / vehicle value ratio
-    amount_ratio = claim["claim_amount"] / vehicle["estimated_value"]
 
-    # Past claims in last 30 days
-    start_window = claim["submitted_at"] - datetime.timedelta(days=30)
-    recent_claims = list(claims_col.find({
-        "policy_id": claim["policy_id"],
-        "submitted_at": {"$gte": start_window, "$lt": claim["submitted_at"]}
-    }))
-    recent_claim_count = len(recent_claims)
+def save_state(high_water_mark, n_seen, reservoir):
+    with open(STATE_PATH, "w") as f:
+        json.dump({
+            "high_water_mark": high_water_mark.isoformat(),
+            "n_seen": int(n_seen),
+            "trained_at": datetime.datetime.now().isoformat()
+        }, f, indent=2)
+    np.save(RESERVOIR_PATH, reservoir)
 
-    # Repair shop risk
-    last_event = events_col.find_one({"claim_id": claim["_id"], "event_type": "repair_estimate_added"})
-    risky_shops = ["QuickFix Garage"]
-    repair_shop_risk = 1 if last_event and last_event["metadata"]["repair_shop"] in risky_shops else 0
 
-    # Feature vector
-    return np.array([amount_ratio, days_since_start, recent_claim_count, repair_shop_risk]).reshape(1, -1)
+def ingest_cutoff():
+    return datetime.datetime.now() - datetime.timedelta(seconds=INGEST_GRACE_SECONDS)
 
 
-# Fetching all existing claims and building feature matrix
-claims = list(claims_col.find({}))
+def train_full(reservoir_size=RESERVOIR_SIZE):
+    # Fetching all existing claims and building feature matrix in bulk.
+    # Claims ingested within the grace period are trained on here and picked up
+    # again by the next incremental run (rescoring them twice is harmless).
+    high_water_mark = ingest_cutoff()
+    claim_ids, X = build_feature_matrix()
 
-X = np.vstack([extract_features(c) for c in claims])
+    # Training Isolation Forest
+    clf = train_model(X)
 
-# Training Isolation Forest
-clf = IsolationForest(n_estimators=100, contamination=0.1, random_state=42)
-clf.fit(X)
+    # Saving model
+    joblib.dump(clf, MODEL_PATH)
+    reservoir, n_seen = update_reservoir(None, 0, X, reservoir_size)
+    save_state(high_water_mark, n_seen, reservoir)
+    print("ML model trained and saved.")
 
-# Saving model
-joblib.dump(clf, "models/fraud_model.pkl")
-print("ML model trained and saved.")
+    # Updating ML scores for all existing claims in bulk
+    stats = rescore_claims(clf, claim_ids, X)
+    print(f"All existing claims updated with ML scores! "
+          f"({stats['n_claims']} claims in {stats['seconds']}s, {stats['claims_per_sec']:,.0f} claims/s)")
 
 
-# Updating ML scores for all existing claims
-for claim in claims_col.find({}):
-    features = extract_features(claim)
-    ml_pred = clf.predict(features)[0]
-    ml_score = 50 if ml_pred == -1 else 0
-    fraud_score = min(claim.get("rule_score", 0) + ml_score, 100)
-    claims_col.update_one(
-        {"_id": claim["_id"]},
-        {"$set": {"ml_score": ml_score, "fraud_score": fraud_score}}
-    )
+def affected_claims_query(new_claims):
+    """
+    Claims whose 30-day recent-claim window can include a new claim:
+    the new claims' policies, submitted from the earliest new claim up to
+    RECENT_WINDOW_DAYS after the latest one (a bounded superset)
+    """
+    times = [c["submitted_at"] for c in new_claims]
+    return {
+        "policy_id": {"$in": sorted({c["policy_id"] for c in new_claims})},
+        "submitted_at": {"$gte": min(times), "$lte": max(times) + datetime.timedelta(days=RECENT_WINDOW_DAYS)}
+    }
+
 
-print("All existing claims updated with ML scores!")
\ No newline at end of file
+def train_incremental(reservoir_size=RESERVOIR_SIZE):
+    """
+    Retrains on the reservoir sample of history plus the claims ingested after
+    the high-water mark and rescores only the claims whose features changed
+    (rule scores are recomputed too: their recent-claim counts changed).
+    """
+    loaded = load_state()
+    if loaded is None:
+        print("No training state found, running a full retrain.")
+        return train_full(reservoir_size)
+    state, reservoir = loaded
+
+    high_water_mark = ingest_cutoff()
+    new_claims = list(claims_col.find(
+        {"ingested_at": {"$gt": state["high_water_mark"], "$lte": high_water_mark}},
+        {"policy_id": 1, "submitted_at": 1}
+    ))
+    if not new_claims:
+        print("No new claims since the last training run.")
+        return
+
+    new_ids, X_new = build_feature_matrix({"_id": {"$in": [c["_id"] for c in new_claims]}})
+
+    # Bounded training set: history sample + (at most reservoir_size) new claims
+    X_fit = X_new
+    if len(X_fit) > reservoir_size:
+        X_fit = X_fit[rng.choice(len(X_fit), reservoir_size, replace=False)]
+    n_sampled = len(reservoir)
+    clf = train_model(np.vstack([reservoir, X_fit]))
+    joblib.dump(clf, MODEL_PATH)
+
+    reservoir, n_seen = update_reservoir(reservoir, state["n_seen"], X_new, reservoir_size)
+    save_state(high_water_mark, n_seen, reservoir)
+    print(f"ML model retrained on {n_sampled} sampled + {len(X_fit)} new claims and saved.")
+
+    risky_shops = load_risky_shops()
+    features = build_feature_frame(affected_claims_query(new_claims), risky_shops)
+    rule_scores, _ = evaluate_rules(features, with_risky_shops(DEFAULT_RULES, risky_shops))
+    stats = rescore_claims(clf, features.index, features[FEATURE_COLUMNS].to_numpy(dtype=float),
+                           rule_scores=rule_scores)
+    print(f"Rescored {stats['n_claims']} affected claims ({len(new_ids)} new) in {stats['seconds']}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the Isolation Forest and rescore claims")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Train on a reservoir sample + new claims and rescore only affected claims")
+    parser.add_argument("--reservoir-size", type=int, default=RESERVOIR_SIZE)
+    args = parser.parse_args()
+
+    if args.incremental:
+        train_incremental(args.reservoir_size)
+    else:
+        train_full(args.reservoir_size)
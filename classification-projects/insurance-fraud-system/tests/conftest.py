@@ -0,0 +1,58 @@
+"""
+Tests run against an in-memory mongomock client: pymongo.MongoClient is
+replaced before db.mongo creates its module-level client.
+"""
+
+import sys
+import datetime
+from pathlib import Path
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+import pymongo
+
+pymongo.MongoClient = mongomock.MongoClient
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from db.mongo import db  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    for name in db.list_collection_names():
+        db.drop_collection(name)
+    yield db
+
+
+@pytest.fixture
+def claims_data(clean_db):
+    """
+    Two policies (one vehicle each) and four claims; CLM0004 has no repair estimate
+    """
+    from db.mongo import policies_col, vehicles_col, claims_col, events_col
+
+    vehicles_col.insert_many([
+        {"_id": "VH001", "estimated_value": 1_000_000},
+        {"_id": "VH002", "estimated_value": 500_000},
+    ])
+    policies_col.insert_many([
+        {"_id": "POL001", "policyholder_id": "PH001", "vehicle_id": "VH001",
+         "start_date": datetime.datetime(2024, 1, 1)},
+        {"_id": "POL002", "policyholder_id": "PH002", "vehicle_id": "VH002",
+         "start_date": datetime.datetime(2024, 3, 1)},
+    ])
+    claims = [
+        {"_id": "CLM0001", "policy_id": "POL001", "claim_amount": 200_000, "submitted_at": datetime.datetime(2024, 2, 1)},
+        {"_id": "CLM0002", "policy_id": "POL001", "claim_amount": 300_000, "submitted_at": datetime.datetime(2024, 2, 10)},
+        {"_id": "CLM0003", "policy_id": "POL001", "claim_amount": 1_800_000, "submitted_at": datetime.datetime(2024, 2, 20)},
+        {"_id": "CLM0004", "policy_id": "POL002", "claim_amount": 100_000, "submitted_at": datetime.datetime(2024, 3, 5)},
+    ]
+    claims_col.insert_many([dict(claim) for claim in claims])
+    events_col.insert_many([
+        {"claim_id": "CLM0001", "event_type": "repair_estimate_added", "metadata": {"repair_shop": "Trusted Repairs"}},
+        {"claim_id": "CLM0002", "event_type": "repair_estimate_added", "metadata": {"repair_shop": "FastTrack Auto"}},
+        {"claim_id": "CLM0003", "event_type": "repair_estimate_added", "metadata": {"repair_shop": "QuickFix Garage"}},
+    ])
+    return claims
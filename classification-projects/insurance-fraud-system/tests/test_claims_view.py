@@ -0,0 +1,47 @@
+import datetime
+import pytest
+from db.mongo import claims_col
+from utils.claims_view import build_claims_filter, fetch_claims_page
+
+
+@pytest.fixture
+def claims():
+    docs = [
+        {"_id": "CLM0001", "fraud_score": 70, "claim_amount": 100},
+        {"_id": "CLM0002", "fraud_score": 30, "claim_amount": 300},
+        {"_id": "CLM0003", "claim_amount": 200, "scoring_status": "pending"},
+        {"_id": "CLM0004", "fraud_score": 70, "claim_amount": 300},
+        {"_id": "CLM0005", "scoring_status": "failed"},
+        {"_id": "CLM0006", "fraud_score": None, "claim_amount": 50},
+        {"_id": "CLM0007", "fraud_score": 0, "claim_amount": 10},
+    ]
+    for i, doc in enumerate(docs):
+        doc["submitted_at"] = datetime.datetime(2024, 1, 1) + datetime.timedelta(days=i % 3)
+    claims_col.insert_many(docs)
+    return docs
+
+
+def all_pages(query, sort_field, descending, page_size):
+    ids, cursor = [], None
+    while True:
+        docs, cursor = fetch_claims_page(query, sort_field, descending, page_size, after=cursor)
+        ids.extend(doc["_id"] for doc in docs)
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort_field", ["fraud_score", "claim_amount", "submitted_at"])
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("page_size", [1, 2, 3, 10])
+def test_pages_cover_unscored_claims(claims, sort_field, descending, page_size):
+    ids = all_pages({}, sort_field, descending, page_size)
+
+    expected = [doc["_id"] for doc in claims_col.find({}).sort([(sort_field, -1 if descending else 1),
+                                                               ("_id", -1 if descending else 1)])]
+    assert ids == expected
+    assert len(ids) == len(claims)
+
+
+def test_pages_with_filter(claims):
+    query = build_claims_filter(min_fraud_score=30)
+    assert all_pages(query, "fraud_score", True, 1) == ["CLM0004", "CLM0001", "CLM0002"]
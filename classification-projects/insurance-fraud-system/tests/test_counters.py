@@ -0,0 +1,46 @@
+import threading
+import pytest
+from db.mongo import claims_col
+from db.counters import IdAllocator, reset_counter, sync_counter
+
+
+def test_ids_unique_across_threads():
+    allocators = [IdAllocator("claims", "CLM", block_size=7) for _ in range(3)]
+    ids = []
+    lock = threading.Lock()
+
+    def work(allocator):
+        for _ in range(50):
+            claim_id = allocator.next_id()
+            with lock:
+                ids.append(claim_id)
+
+    threads = [threading.Thread(target=work, args=(a,)) for a in allocators for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(ids) == len(set(ids)) == 300
+
+
+def test_sync_counter_never_moves_backwards():
+    claims_col.insert_many([{"_id": "CLM0007"}, {"_id": "CLM0042"}, {"_id": "OTHER99"}])
+    assert sync_counter("claims", claims_col, "CLM") == 42
+    assert IdAllocator("claims", "CLM").allocate(1) == ["CLM0043"]
+
+    claims_col.delete_one({"_id": "CLM0042"})
+    sync_counter("claims", claims_col, "CLM")
+    assert IdAllocator("claims", "CLM").allocate(1) == ["CLM0044"]
+
+
+def test_reset_counter_refuses_non_empty_collection():
+    allocator = IdAllocator("claims", "CLM")
+    claims_col.insert_one({"_id": allocator.next_id()})
+
+    with pytest.raises(ValueError):
+        reset_counter("claims", claims_col)
+
+    claims_col.delete_many({})
+    reset_counter("claims", claims_col)
+    assert IdAllocator("claims", "CLM").allocate(1) == ["CLM0001"]
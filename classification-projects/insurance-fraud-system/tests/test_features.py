@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from utils.features import FEATURE_COLUMNS, build_feature_frame, extract_features
+from utils.fraud import compute_fraud_score
+
+
+def test_build_feature_frame(claims_data):
+    features = build_feature_frame()
+
+    row = features.loc["CLM0003"]
+    assert row["amount_ratio"] == pytest.approx(1.8)
+    assert row["days_since_start"] == 50
+    assert row["recent_claim_count"] == 2
+    assert row["repair_shop"] == "QuickFix Garage"
+    assert row["repair_shop_risk"] == 1
+
+    assert features.loc["CLM0004", "recent_claim_count"] == 0
+    assert features.loc["CLM0004", "repair_shop_risk"] == 0
+
+
+def test_single_claim_path_matches_bulk(claims_data):
+    features = build_feature_frame()
+    for claim in claims_data:
+        np.testing.assert_array_equal(
+            extract_features(claim), features.loc[[claim["_id"]], FEATURE_COLUMNS].to_numpy(dtype=float)
+        )
+
+    # high_amount_ratio + frequent_claims + risky_repair_shop
+    assert compute_fraud_score(claims_data[2]) == 70
+    # early_claim only
+    assert compute_fraud_score(claims_data[3]) == 30
+    assert extract_features(claims_data[2], risky_shops=[])[0, -1] == 0
+
+
+def test_missing_policy(claims_data):
+    from db.mongo import claims_col
+    claims_col.insert_one({"_id": "CLM0005", "policy_id": "NOPE", "claim_amount": 1,
+                           "submitted_at": claims_data[0]["submitted_at"]})
+
+    assert "CLM0005" not in build_feature_frame().index
+    with pytest.raises(ValueError):
+        compute_fraud_score({"_id": "CLM0005"})
+
+
+def test_single_claim_shares_one_feature_frame(claims_data, monkeypatch):
+    import utils.features as features_module
+    import utils.fraud as fraud_module
+
+    claim = claims_data[2]
+    risky_shops = ["QuickFix Garage"]
+    features = features_module.claim_feature_frame(claim, risky_shops)
+
+    def no_queries(*args, **kwargs):
+        raise AssertionError("claim context fetched again")
+    monkeypatch.setattr(features_module, "build_feature_frame", no_queries)
+    monkeypatch.setattr(fraud_module, "load_risky_shops", no_queries)
+
+    assert fraud_module.compute_fraud_score(claim, features=features, risky_shops=risky_shops) == 70
+    np.testing.assert_array_equal(
+        extract_features(claim, features=features), features[FEATURE_COLUMNS].to_numpy(dtype=float)
+    )
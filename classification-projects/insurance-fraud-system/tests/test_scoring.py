@@ -0,0 +1,63 @@
+import numpy as np
+from db.mongo import claims_col
+from utils.scoring import bulk_set_fields, rescore_claims, ML_ANOMALY_SCORE
+
+
+class FixedModel:
+    """Isolation Forest stand-in: rows with a first feature > 0 are outliers"""
+
+    def predict(self, X):
+        return np.where(X[:, 0] > 0, -1, 1)
+
+
+def insert_claims(rule_scores):
+    ids = [f"CLM{i:04d}" for i in range(1, len(rule_scores) + 1)]
+    claims_col.insert_many([
+        {"_id": claim_id, "rule_score": score, "ml_score": 0, "fraud_score": score}
+        for claim_id, score in zip(ids, rule_scores)
+    ])
+    return ids
+
+
+def test_rescore_claims_across_chunks():
+    rule_scores = [0, 10, 80, 30, 60, 0, 100]
+    ids = insert_claims(rule_scores)
+    outlier = np.array([1, 0, 1, 0, 1, 1, 0])
+    X = np.column_stack([outlier, np.zeros(len(ids))]).astype(float)
+
+    stats = rescore_claims(FixedModel(), ids, X, chunk_size=3, verbose=False)
+
+    assert stats["n_claims"] == 7
+    # Claims with an unchanged ml_score / fraud_score are not modified
+    assert stats["n_modified"] == int(outlier.sum())
+    for claim_id, rule, is_outlier in zip(ids, rule_scores, outlier):
+        doc = claims_col.find_one({"_id": claim_id})
+        ml = ML_ANOMALY_SCORE if is_outlier else 0
+        assert doc["ml_score"] == ml
+        assert doc["fraud_score"] == min(rule + ml, 100)
+        assert doc["rule_score"] == rule
+
+    # Re-running with the same model changes nothing
+    assert rescore_claims(FixedModel(), ids, X, chunk_size=3, verbose=False)["n_modified"] == 0
+
+
+def test_rescore_claims_missing_rule_score_and_claim():
+    claims_col.insert_one({"_id": "CLM0001"})
+    stats = rescore_claims(FixedModel(), ["CLM0001", "CLM9999"], np.ones((2, 1)), verbose=False)
+
+    assert stats["n_claims"] == 2
+    assert stats["n_modified"] == 1
+    assert claims_col.find_one({"_id": "CLM0001"})["fraud_score"] == ML_ANOMALY_SCORE
+    assert claims_col.find_one({"_id": "CLM9999"}) is None
+
+
+def test_bulk_set_fields_across_chunks():
+    ids = insert_claims([0] * 5)
+    n_modified = bulk_set_fields(ids, {
+        "rule_score": np.array([0, 10, 20, 0, 40]),
+        "fraud_score": np.array([0, 10, 20, 0, 45]),
+    }, chunk_size=2, verbose=False)
+
+    assert n_modified == 3
+    assert [d["fraud_score"] for d in claims_col.find({}, sort=[("_id", 1)])] == [0, 10, 20, 0, 45]
+    assert all(type(d["rule_score"]) is int for d in claims_col.find())
@@ -0,0 +1,90 @@
+import datetime
+import numpy as np
+import pytest
+from db.mongo import claims_col
+from utils.fraud import compute_fraud_score
+from utils.scoring_queue import (ScoringWorker, enqueue_claim, lease_batch, score_batch, requeue_stale,
+                                 get_scoring_result, PENDING, SCORING, SCORED, FAILED, MAX_ATTEMPTS)
+
+
+class OutlierModel:
+    """Isolation Forest stand-in: amount_ratio > 1 is an outlier; raises on amount_ratio > 10"""
+
+    def predict(self, X):
+        if (X[:, 0] > 10).any():
+            raise ValueError("bad feature row")
+        return np.where(X[:, 0] > 1, -1, 1)
+
+
+def claim_vehicle_value(claim):
+    return {"POL001": 1_000_000, "POL002": 500_000}[claim["policy_id"]]
+
+
+@pytest.fixture
+def queue(claims_data):
+    # The fixture claims are already stored; put them back in the queue plus one orphan
+    claims_col.delete_many({})
+    for claim in claims_data:
+        enqueue_claim(claim)
+    enqueue_claim({"_id": "CLM0009", "policy_id": "NOPE", "claim_amount": 1,
+                   "submitted_at": datetime.datetime(2024, 2, 1)})
+    return claims_data
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    worker = ScoringWorker(model_path="unused.pkl", batch_size=2)
+    monkeypatch.setattr(worker, "_get_model", lambda: OutlierModel())
+    return worker
+
+
+def test_lease_score_and_fail(queue):
+    token, leased = lease_batch(batch_size=10)
+    assert sorted(leased) == ["CLM0001", "CLM0002", "CLM0003", "CLM0004", "CLM0009"]
+    assert lease_batch()[1] == []
+    assert claims_col.count_documents({"scoring_status": SCORING, "scoring_attempts": 1}) == 5
+
+    assert score_batch(OutlierModel(), token, leased, ["QuickFix Garage"]) == 4
+
+    for claim in queue:
+        result = get_scoring_result(claim["_id"])
+        ml = 50 if claim["claim_amount"] > claim_vehicle_value(claim) else 0
+        assert result["scoring_status"] == SCORED
+        assert result["rule_score"] == compute_fraud_score(claim)
+        assert result["ml_score"] == ml
+        assert result["fraud_score"] == min(result["rule_score"] + ml, 100)
+    assert get_scoring_result("CLM0009")["scoring_status"] == FAILED
+    assert claims_col.count_documents({"scoring_lease": {"$exists": True}}) == 0
+
+
+def test_worker_drains_in_batches(queue, worker):
+    assert worker.drain() == 5
+    assert worker.stats()["batches"] == 3
+    assert claims_col.count_documents({"scoring_status": SCORED}) == 4
+    assert claims_col.count_documents({"scoring_status": PENDING}) == 0
+
+
+def test_bad_claim_fails_alone_after_max_attempts(queue, worker):
+    claims_col.update_one({"_id": "CLM0002"}, {"$set": {"claim_amount": 50_000_000}})
+
+    worker.drain()
+
+    bad = claims_col.find_one({"_id": "CLM0002"})
+    assert bad["scoring_status"] == FAILED
+    assert bad["scoring_attempts"] == MAX_ATTEMPTS
+    assert "bad feature row" in bad["scoring_error"]
+    # CLM0001 shared its batch and was retried on its own
+    assert claims_col.count_documents({"scoring_status": SCORED}) == 3
+    assert worker.stats()["errors"] == MAX_ATTEMPTS
+
+
+def test_requeue_stale_leases(queue):
+    lease_batch(batch_size=2)
+    old = datetime.datetime.now() - datetime.timedelta(minutes=5)
+    claims_col.update_many({"scoring_status": SCORING}, {"$set": {"scoring_started_at": old}})
+    claims_col.update_one({"scoring_status": SCORING}, {"$set": {"scoring_attempts": MAX_ATTEMPTS}})
+
+    assert requeue_stale(timeout=60) == (1, 1)
+    assert claims_col.count_documents({"scoring_status": PENDING}) == 4
+    assert claims_col.count_documents({"scoring_status": FAILED, "scoring_error": "lease expired"}) == 1
+    assert requeue_stale(timeout=60) == (0, 0)
@@ -0,0 +1,105 @@
+import datetime
+import pytest
+from bson import ObjectId
+from db.mongo import claims_col, events_col, shop_edges_col, reference_col
+from utils.features import build_feature_frame
+from utils.reference_cache import load_risky_shops
+from utils.shop_graph import (GRAPH_STATE_ID, update_shop_graph, compute_shop_risk, publish_shop_risk,
+                              rebuild_shop_graph)
+
+
+@pytest.fixture
+def graph(claims_data):
+    # CLM0005: second policyholder at QuickFix Garage, with a later second estimate elsewhere
+    claims_col.insert_one({"_id": "CLM0005", "policy_id": "POL002", "claim_amount": 100_000,
+                           "submitted_at": datetime.datetime(2024, 4, 1)})
+    events_col.insert_many([
+        {"claim_id": "CLM0005", "event_type": "repair_estimate_added", "metadata": {"repair_shop": "QuickFix Garage"}},
+        {"claim_id": "CLM0005", "event_type": "repair_estimate_added", "metadata": {"repair_shop": "Trusted Repairs"}},
+    ])
+    return claims_data
+
+
+def set_scores(scores):
+    for claim_id, (rule, ml) in scores.items():
+        claims_col.update_one({"_id": claim_id}, {"$set": {"rule_score": rule, "ml_score": ml}})
+
+
+def test_edges_are_idempotent(graph):
+    assert update_shop_graph(batch_size=2) == 5
+    assert update_shop_graph() == 0
+    edges = {doc["_id"]: doc for doc in shop_edges_col.find()}
+    assert set(edges) == {"CLM0001", "CLM0002", "CLM0003", "CLM0005"}
+    assert edges["CLM0005"]["shop"] == "QuickFix Garage"
+    assert edges["CLM0005"]["policyholder_id"] == "PH002"
+
+    # Crash after the edge writes but before the checkpoint: the replay adds nothing
+    reference_col.delete_one({"_id": GRAPH_STATE_ID})
+    assert update_shop_graph() == 5
+    assert {doc["_id"]: doc for doc in shop_edges_col.find()} == edges
+    assert rebuild_shop_graph() == 5
+
+
+def test_late_event_with_lower_object_id_is_not_skipped(graph):
+    assert update_shop_graph() == 5
+
+    # Inserted after that run by a client whose ObjectId sorts before every other event
+    claims_col.insert_one({"_id": "CLM0006", "policy_id": "POL002", "claim_amount": 1_000,
+                           "submitted_at": datetime.datetime(2024, 4, 2)})
+    events_col.insert_many([
+        {"_id": ObjectId("000000000000000000000001"), "claim_id": "CLM0006",
+         "event_type": "repair_estimate_added", "metadata": {"repair_shop": "FastTrack Auto"},
+         "ingested_at": datetime.datetime.now() - datetime.timedelta(seconds=30)},
+        {"claim_id": "CLM0007", "event_type": "repair_estimate_added", "metadata": None,
+         "ingested_at": datetime.datetime.now() - datetime.timedelta(seconds=30)},
+    ])
+
+    # Still inside the grace period
+    assert update_shop_graph() == 0
+    assert update_shop_graph(grace_seconds=0) == 2
+    assert shop_edges_col.find_one({"_id": "CLM0006"})["shop"] == "FastTrack Auto"
+    assert shop_edges_col.find_one({"_id": "CLM0007"}) is None
+
+
+def test_claims_without_links_get_no_entity_node(graph):
+    update_shop_graph()
+    shop_edges_col.update_one({"_id": "CLM0005"}, {"$unset": {"policyholder_id": ""}})
+    shop_edges_col.insert_one({"_id": "CLM0004", "shop": "Lonely Garage", "policyholder_id": None,
+                               "vehicle_id": float("nan")})
+
+    risk = compute_shop_risk(min_claims=1)
+    assert risk.loc["Lonely Garage", "claims"] == 1
+    assert risk.loc["Lonely Garage", "component_entities"] == 0
+    assert risk.loc["Lonely Garage", "shared_shops"] == 0
+    assert risk.loc["QuickFix Garage", "claims"] == 2
+
+
+def test_risk_uses_current_scores_without_shop_rule(graph):
+    update_shop_graph()
+    # QuickFix claims score 60 only because of the shop rule (10) -> not high
+    set_scores({"CLM0001": (0, 0), "CLM0002": (0, 0), "CLM0003": (10, 50), "CLM0005": (10, 50)})
+    risk = compute_shop_risk(min_claims=1, min_lift=1.5)
+    assert risk["high_score_rate"].max() == 0
+    assert not risk["risky"].any()
+
+    # Rescoring after the edges were written is picked up
+    set_scores({"CLM0003": (50, 50), "CLM0005": (30, 50)})
+    risk = compute_shop_risk(min_claims=1, min_lift=1.5)
+    assert risk.loc["QuickFix Garage", "claims"] == 2
+    assert risk.loc["QuickFix Garage", "high_score_rate"] == 1.0
+    assert risk.loc["Trusted Repairs", "high_score_rate"] == 0
+    assert risk.index[risk["risky"]].tolist() == ["QuickFix Garage"]
+    # POL001's policyholder/vehicle links QuickFix, Trusted Repairs and FastTrack Auto
+    assert risk.loc["Trusted Repairs", "shared_shops"] == 2
+    assert risk.loc["QuickFix Garage", "component_shops"] == 3
+
+
+def test_published_list_is_used_for_features(graph):
+    update_shop_graph()
+    set_scores({"CLM0001": (70, 50), "CLM0002": (0, 0), "CLM0003": (0, 0), "CLM0005": (0, 0)})
+    publish_shop_risk(compute_shop_risk(min_claims=1, min_lift=1.5))
+
+    assert load_risky_shops() == ["Trusted Repairs"]
+    features = build_feature_frame()
+    assert features.loc["CLM0001", "repair_shop_risk"] == 1
+    assert features.loc["CLM0003", "repair_shop_risk"] == 0
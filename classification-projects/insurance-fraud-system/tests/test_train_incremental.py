@@ -0,0 +1,52 @@
+import datetime
+import pytest
+from db.mongo import claims_col
+from scripts import train_ml_model
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setattr(train_ml_model, "MODEL_PATH", str(tmp_path / "model.pkl"))
+    monkeypatch.setattr(train_ml_model, "STATE_PATH", str(tmp_path / "state.json"))
+    monkeypatch.setattr(train_ml_model, "RESERVOIR_PATH", str(tmp_path / "reservoir.npy"))
+
+
+def test_backdated_claim_is_picked_up(claims_data, paths):
+    train_ml_model.train_full()
+    state, reservoir = train_ml_model.load_state()
+    assert len(reservoir) == 4
+
+    # Inserted after the full run, but with an accident date before every claim of POL001
+    claims_col.insert_one({
+        "_id": "CLM0005", "policy_id": "POL001", "claim_amount": 100_000,
+        "submitted_at": datetime.datetime(2024, 1, 25),
+        "ingested_at": datetime.datetime.now() - datetime.timedelta(seconds=train_ml_model.INGEST_GRACE_SECONDS)
+    })
+    # Stale stored rule score; CLM0001 / CLM0002 now have a recent claim before them
+    claims_col.update_many({}, {"$set": {"rule_score": 0}})
+    state["high_water_mark"] = datetime.datetime.now() - datetime.timedelta(hours=1)
+    train_ml_model.save_state(state["high_water_mark"], state["n_seen"], reservoir)
+
+    train_ml_model.train_incremental()
+
+    state, reservoir = train_ml_model.load_state()
+    assert state["n_seen"] == 5
+    assert claims_col.find_one({"_id": "CLM0005"})["rule_score"] == 0
+    # frequent_claims: two POL001 claims in the 30 days before
+    assert claims_col.find_one({"_id": "CLM0002"})["rule_score"] == 20
+    # + high_amount_ratio + risky_repair_shop
+    assert claims_col.find_one({"_id": "CLM0003"})["rule_score"] == 70
+    # Other policies are not rescored
+    assert claims_col.find_one({"_id": "CLM0004"})["rule_score"] == 0
+
+
+def test_no_new_claims(claims_data, paths, capsys):
+    train_ml_model.train_full()
+    train_ml_model.train_incremental()
+    assert "No new claims" in capsys.readouterr().out
+
+
+def test_full_retrain_includes_fresh_claims(claims_data, paths):
+    claims_col.update_many({}, {"$set": {"ingested_at": datetime.datetime.now()}})
+    train_ml_model.train_full()
+    assert train_ml_model.load_state()[0]["n_seen"] == 4
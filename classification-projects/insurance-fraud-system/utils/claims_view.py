@@ -0,0 +1,71 @@
+import datetime
+from pymongo import ASCENDING, DESCENDING
+from db.mongo import claims_col
+
+VIEW_FIELDS = ["_id", "policy_id", "claim_type", "claim_amount", "submitted_at",
+               "status", "scoring_status", "rule_score", "ml_score", "fraud_score"]
+SORT_FIELDS = ["submitted_at", "fraud_score", "claim_amount"]
+
+
+def build_claims_filter(min_fraud_score=None, statuses=None, start_date=None, end_date=None):
+    """
+    MongoDB filter for the View Claims tab (dates are inclusive days)
+    """
+    query = {}
+    if min_fraud_score:
+        query["fraud_score"] = {"$gte": min_fraud_score}
+    if statuses:
+        query["status"] = {"$in": list(statuses)}
+    if start_date or end_date:
+        query["submitted_at"] = {}
+        if start_date:
+            query["submitted_at"]["$gte"] = datetime.datetime.combine(start_date, datetime.time.min)
+        if end_date:
+            query["submitted_at"]["$lt"] = datetime.datetime.combine(end_date + datetime.timedelta(days=1),
+                                                                     datetime.time.min)
+    return query
+
+
+def _after_filter(sort_field, descending, value, last_id):
+    """
+    Rows after (value, last_id) in (sort_field, _id) order. MongoDB sorts null and
+    missing values below everything else, but $lt / $gt never match them, so
+    unscored claims (no fraud_score yet) are handled explicitly.
+    """
+    op = "$lt" if descending else "$gt"
+    same_value = {sort_field: value, "_id": {op: last_id}}
+    if value is None:
+        # Descending: only nulls remain; ascending: every non-null value follows
+        return same_value if descending else {"$or": [same_value, {sort_field: {"$ne": None}}]}
+
+    branches = [{sort_field: {op: value}}, same_value]
+    if descending:
+        branches.append({sort_field: None})
+    return {"$or": branches}
+
+
+def fetch_claims_page(query, sort_field="submitted_at", descending=True, page_size=50, after=None,
+                      collection=None):
+    """
+    Keyset pagination: one index-backed, projected query per page.
+    after is the (sort value, _id) of the last row of the previous page.
+    Returns: (list of claim documents, cursor for the next page or None)
+    """
+    collection = claims_col if collection is None else collection
+    if sort_field not in SORT_FIELDS:
+        raise ValueError(f"Cannot sort claims by {sort_field}")
+
+    if after is not None:
+        query = {"$and": [query, _after_filter(sort_field, descending, *after)]}
+
+    direction = DESCENDING if descending else ASCENDING
+    docs = list(
+        collection.find(query, {field: 1 for field in VIEW_FIELDS})
+        .sort([(sort_field, direction), ("_id", direction)])
+        .limit(page_size + 1)
+    )
+
+    has_more = len(docs) > page_size
+    docs = docs[:page_size]
+    next_cursor = (docs[-1].get(sort_field), docs[-1]["_id"]) if has_more else None
+    return docs, next_cursor
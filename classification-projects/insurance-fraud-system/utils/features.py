@@ -0,0 +1,164 @@
+import logging
+import numpy as np
+import pandas as pd
+from db.mongo import claims_col, policies_col, vehicles_col, events_col
+from utils.reference_cache import load_risky_shops
+
+RECENT_WINDOW_DAYS = 30
+FEATURE_COLUMNS = ["amount_ratio", "days_since_start", "recent_claim_count", "repair_shop_risk"]
+
+logger = logging.getLogger(__name__)
+
+# Large $in lists are split so a single query stays well below the 16MB BSON limit
+IN_CHUNK_SIZE = 50_000
+
+
+def claim_feature_frame(claim, risky_shops=None):
+    """
+    One-row build_feature_frame for a single stored claim
+    """
+    features = build_feature_frame({"_id": claim["_id"]}, risky_shops)
+    if features.empty:
+        raise ValueError(f"Claim {claim['_id']} not found or its policy / vehicle is missing")
+    return features
+
+
+def extract_features(claim, risky_shops=None, features=None):
+    """
+    Create a feature vector for ML model (single stored claim), via the same
+    bulk path as training and the scoring worker. Pass the claim_feature_frame
+    already built for compute_fraud_score as features to skip the queries.
+    """
+    features = claim_feature_frame(claim, risky_shops) if features is None else features
+    return features.loc[[claim["_id"]], FEATURE_COLUMNS].to_numpy(dtype=float)
+
+
+def find_frame(col, query, projection, in_field=None, in_values=None):
+    """
+    Runs a projected find, optionally as chunked {in_field: {"$in": in_values}} queries,
+    and returns the documents as a DataFrame with the projected columns
+    """
+    columns = list(dict.fromkeys(field.split(".")[0] for field, include in projection.items() if include))
+    if in_field is None:
+        return pd.DataFrame(list(col.find(query, projection)), columns=columns)
+
+    values = list(in_values)
+    docs = []
+    for start in range(0, len(values), IN_CHUNK_SIZE):
+        chunk_query = {**query, in_field: {"$in": values[start:start + IN_CHUNK_SIZE]}}
+        docs.extend(col.find(chunk_query, projection))
+    return pd.DataFrame(docs, columns=columns)
+
+
+def recent_claim_counts(claims, history, window_days=RECENT_WINDOW_DAYS):
+    """
+    Number of claims of the same policy submitted in [submitted_at - window, submitted_at)
+    for every row of claims, counted over history (policy_id, submitted_at).
+    Both frames are mapped onto one sorted int64 key (policy code, milliseconds),
+    so each window is two binary searches instead of a query.
+    """
+    if claims.empty:
+        return np.zeros(0, dtype=np.int64)
+
+    policy_codes = pd.Index(history["policy_id"].unique())
+    hist_codes = policy_codes.get_indexer(history["policy_id"]).astype(np.int64)
+    claim_codes = policy_codes.get_indexer(claims["policy_id"]).astype(np.int64)
+
+    # MongoDB stores datetimes with millisecond precision, so ms keys are exact
+    hist_ms = history["submitted_at"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    claim_ms = claims["submitted_at"].to_numpy(dtype="datetime64[ms]").astype(np.int64)
+    window_ms = window_days * 24 * 3600 * 1000
+
+    origin = min(hist_ms.min(), claim_ms.min()) - window_ms
+    span = max(hist_ms.max(), claim_ms.max()) - origin + 1
+    if len(policy_codes) * span >= 2 ** 62:
+        raise ValueError("Too many policies for a single int64 window key")
+
+    hist_keys = np.sort(hist_codes * span + (hist_ms - origin))
+    claim_keys = claim_codes * span + (claim_ms - origin)
+
+    upper = np.searchsorted(hist_keys, claim_keys, side="left")
+    lower = np.searchsorted(hist_keys, claim_keys - window_ms, side="left")
+    return upper - lower
+
+
+def build_feature_frame(query=None, risky_shops=None):
+    """
+    Bulk version of extract_features for every claim matching query (all claims by default).
+    Claims, policies, vehicles and repair events are fetched with a few projected
+    queries and joined in pandas instead of ~4 queries per claim.
+    repair_shop_risk uses the published risky-shop list unless risky_shops is given,
+    so training and live scoring agree.
+    Returns: DataFrame indexed by claim _id with FEATURE_COLUMNS (plus the raw
+    repair_shop used by the rule engine)
+    """
+    claims = find_frame(
+        claims_col, query or {},
+        {"_id": 1, "policy_id": 1, "claim_amount": 1, "submitted_at": 1}
+    )
+    if claims.empty:
+        return pd.DataFrame(columns=FEATURE_COLUMNS + ["repair_shop"], index=pd.Index([], name="_id"))
+
+    policy_ids = claims["policy_id"].unique()
+    policies = find_frame(
+        policies_col, {}, {"_id": 1, "vehicle_id": 1, "start_date": 1},
+        "_id", policy_ids
+    ).rename(columns={"_id": "policy_id"})
+    vehicles = find_frame(
+        vehicles_col, {}, {"_id": 1, "estimated_value": 1},
+        "_id", policies["vehicle_id"].unique()
+    ).rename(columns={"_id": "vehicle_id"})
+    repairs = find_frame(
+        events_col, {"event_type": "repair_estimate_added"}, {"claim_id": 1, "metadata.repair_shop": 1},
+        "claim_id", claims["_id"]
+    )
+
+    # The 30-day window needs every claim of these policies, not only the selected ones
+    if query:
+        history = find_frame(
+            claims_col, {}, {"policy_id": 1, "submitted_at": 1},
+            "policy_id", policy_ids
+        )
+    else:
+        history = claims[["policy_id", "submitted_at"]]
+
+    df = (
+        claims
+        .merge(policies, on="policy_id", how="left")
+        .merge(vehicles, on="vehicle_id", how="left")
+    )
+
+    missing = df["start_date"].isna() | df["estimated_value"].isna()
+    if missing.any():
+        logger.warning("Skipping %d claims with a missing policy or vehicle", int(missing.sum()))
+        df = df[~missing].reset_index(drop=True)
+        if df.empty:
+            return pd.DataFrame(columns=FEATURE_COLUMNS + ["repair_shop"], index=pd.Index([], name="_id"))
+
+    # Same first-match semantics as find_one on claim_events
+    if repairs.empty:
+        shops = pd.Series(dtype=object)
+    else:
+        repairs = repairs.drop_duplicates("claim_id")
+        shops = pd.Series(
+            [m.get("repair_shop") if isinstance(m, dict) else None for m in repairs["metadata"]],
+            index=repairs["claim_id"]
+        )
+
+    features = pd.DataFrame(index=pd.Index(df["_id"], name="_id"))
+    features["amount_ratio"] = (df["claim_amount"] / df["estimated_value"]).to_numpy()
+    features["days_since_start"] = (df["submitted_at"] - df["start_date"]).dt.days.to_numpy()
+    features["recent_claim_count"] = recent_claim_counts(df, history)
+    features["repair_shop"] = df["_id"].map(shops).to_numpy()
+    risky_shops = load_risky_shops() if risky_shops is None else risky_shops
+    features["repair_shop_risk"] = features["repair_shop"].isin(risky_shops).astype(int)
+
+    return features
+
+
+def build_feature_matrix(query=None, risky_shops=None):
+    """
+    Returns: (claim ids, feature matrix with the same columns as extract_features)
+    """
+    features = build_feature_frame(query, risky_shops)
+    return features.index.to_numpy(), features[FEATURE_COLUMNS].to_numpy(dtype=float)
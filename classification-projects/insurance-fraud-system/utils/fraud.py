@@ -1,36 +1,23 @@
-import datetime
-from db.mongo import policies_col, vehicles_col, claims_col, events_col
+from utils.features import claim_feature_frame
+from utils.reference_cache import load_risky_shops
+from utils.rules import DEFAULT_RULES, evaluate_rules, with_risky_shops
 
-def compute_fraud_score(claim):
-    """
-    Compute a simple rule-based fraud score (0-100)
-    """
-    score = 0
-
-    # Amount vs estimated vehicle value
-    policy = policies_col.find_one({"_id": claim["policy_id"]})
-    vehicle = vehicles_col.find_one({"_id": policy["vehicle_id"]})
-    if claim["claim_amount"] > 1.5 * vehicle["estimated_value"]:
-        score += 40  # High claim relative to vehicle value
-
-    # Time since policy start
-    days_since_start = (claim["submitted_at"] - policy["start_date"]).days
-    if days_since_start < 14:
-        score += 30  # Early claim
 
-    # Previous claims in last 30 days
-    start_window = claim["submitted_at"] - datetime.timedelta(days=30)
-    recent_claims = list(claims_col.find({
-        "policy_id": claim["policy_id"],
-        "submitted_at": {"$gte": start_window, "$lt": claim["submitted_at"]}
-    }))
-    if len(recent_claims) >= 2:
-        score += 20
-
-    # Repair shop risk
-    last_event = events_col.find_one({"claim_id": claim["_id"], "event_type": "repair_estimate_added"})
-    risky_shops = ["QuickFix Garage"]
-    if last_event and last_event["metadata"]["repair_shop"] in risky_shops:
-        score += 10
+def compute_fraud_score(claim, rules=None, features=None, risky_shops=None):
+    """
+    Compute a rule-based fraud score (0-100) with the rule engine in utils/rules.py
+    for a single stored claim (DEFAULT_RULES with the published risky-shop list
+    unless another rule set is given). Scoring one claim with both models loads
+    its context once and shares it:
 
-    return min(score, 100)
+        risky_shops = load_risky_shops()
+        features = claim_feature_frame(claim, risky_shops)
+        rule_score = compute_fraud_score(claim, features=features, risky_shops=risky_shops)
+        ml_input = extract_features(claim, features=features)
+    """
+    if risky_shops is None and (rules is None or features is None):
+        risky_shops = load_risky_shops()
+    rules = with_risky_shops(DEFAULT_RULES, risky_shops) if rules is None else rules
+    features = claim_feature_frame(claim, risky_shops) if features is None else features
+    scores, _ = evaluate_rules(features.loc[[claim["_id"]]], rules)
+    return int(scores[0])
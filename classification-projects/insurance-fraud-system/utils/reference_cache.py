@@ -0,0 +1,116 @@
+import time
+import threading
+from collections import OrderedDict
+from db.mongo import policies_col, reference_col
+
+# Used until the shop graph (utils/shop_graph.py) publishes a list
+RISKY_SHOPS = ["QuickFix Garage"]
+REFERENCE_KINDS = ("policies", "risky_shops")
+VERSIONS_ID = "versions"
+RISKY_SHOPS_ID = "risky_shops"
+SHOP_RISK_ID = "shop_risk"
+
+
+def bump_reference_version(*kinds):
+    """
+    Called by writers after changing policies or the risky-shop list,
+    so every ReferenceCache drops its entries of that kind on its next check
+    """
+    reference_col.update_one(
+        {"_id": VERSIONS_ID},
+        {"$inc": {kind: 1 for kind in (kinds or REFERENCE_KINDS)}},
+        upsert=True
+    )
+
+
+def load_risky_shops():
+    """
+    Published risky-shop list (uncached; the app goes through ReferenceCache)
+    """
+    doc = reference_col.find_one({"_id": RISKY_SHOPS_ID})
+    return list(doc["shops"]) if doc else list(RISKY_SHOPS)
+
+
+def set_risky_shops(shops):
+    reference_col.update_one({"_id": RISKY_SHOPS_ID}, {"$set": {"shops": list(shops)}}, upsert=True)
+    bump_reference_version("risky_shops")
+
+
+class ReferenceCache:
+    """
+    TTL + LRU cache for slowly-changing reference data (the policy dropdown,
+    risky repair shops). Entries expire after ttl seconds; in addition a
+    version document in reference_data is polled at most every check_interval
+    seconds and any kind whose version changed is invalidated immediately.
+    """
+
+    def __init__(self, ttl=300, max_entries=10_000, check_interval=5):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+
+        self._entries = OrderedDict()  # (kind, key) -> (expires_at, value)
+        self._versions = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _check_versions(self):
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+
+        versions = reference_col.find_one({"_id": VERSIONS_ID}) or {}
+        for kind in REFERENCE_KINDS:
+            version = versions.get(kind, 0)
+            if kind in self._versions and self._versions[kind] != version:
+                self.invalidate(kind)
+            self._versions[kind] = version
+
+    def invalidate(self, kind=None):
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for entry in [k for k in self._entries if k[0] == kind]:
+                    del self._entries[entry]
+
+    def _get(self, kind, key, loader):
+        self._check_versions()
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end((kind, key))
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Loaded outside the lock; a concurrent miss just loads the same document twice
+        value = loader()
+
+        with self._lock:
+            self._entries[(kind, key)] = (now + self.ttl, value)
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def policy_options(self):
+        """
+        {policy_id: label} for the policy dropdown (projected query)
+        """
+        return self._get("policies", "__options__", lambda: {
+            p["_id"]: f"{p['_id']} - {p['coverage_type']}"
+            for p in policies_col.find({}, {"coverage_type": 1}).sort("_id", 1)
+        })
+
+    def risky_shops(self):
+        return self._get("risky_shops", RISKY_SHOPS_ID, load_risky_shops)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,103 @@
+import time
+import numpy as np
+from pymongo import UpdateOne
+from db.mongo import claims_col
+
+ML_ANOMALY_SCORE = 50  # Isolation Forest outlier -> ML score 0-50
+MAX_FRAUD_SCORE = 100
+
+
+def ml_scores(model, X):
+    """
+    Vectorized ML score for a feature matrix (Isolation Forest: -1 = outlier, 1 = normal)
+    """
+    if len(X) == 0:
+        return np.zeros(0, dtype=int)
+    return np.where(model.predict(X) == -1, ML_ANOMALY_SCORE, 0)
+
+
+def hybrid_scores(rule_scores, ml):
+    """
+    Hybrid score: rule-based + ML-based, capped at 100
+    """
+    return np.minimum(np.asarray(rule_scores) + np.asarray(ml), MAX_FRAUD_SCORE)
+
+
+def bulk_set_fields(claim_ids, fields, collection=None, chunk_size=5000, verbose=True):
+    """
+    Writes per-claim values ({field: array aligned with claim_ids}) with chunked
+    unordered bulk_write
+    Returns: number of modified documents
+    """
+    collection = claims_col if collection is None else collection
+    claim_ids = list(claim_ids)
+    start = time.perf_counter()
+    n_modified = 0
+
+    for offset in range(0, len(claim_ids), chunk_size):
+        ids = claim_ids[offset:offset + chunk_size]
+        values = {name: np.asarray(column)[offset:offset + chunk_size] for name, column in fields.items()}
+        result = collection.bulk_write([
+            UpdateOne({"_id": claim_id}, {"$set": {name: values[name][i].item() for name in values}})
+            for i, claim_id in enumerate(ids)
+        ], ordered=False)
+        n_modified += result.modified_count
+
+        if verbose:
+            done = offset + len(ids)
+            rate = done / max(time.perf_counter() - start, 1e-9)
+            print(f"Updated {done}/{len(claim_ids)} claims ({rate:,.0f} claims/s)")
+
+    return n_modified
+
+
+def rescore_claims(model, claim_ids, X, collection=None, chunk_size=5000, verbose=True, rule_scores=None):
+    """
+    Predicts the whole feature matrix in one call and writes ml_score / fraud_score
+    with chunked unordered bulk_write. Rule scores are read with projected queries,
+    unless freshly computed rule_scores (aligned with claim_ids) are given; those
+    are written as well.
+    Returns: dict with claim count, modified count, elapsed seconds and claims/sec
+    """
+    collection = claims_col if collection is None else collection
+    start = time.perf_counter()
+
+    claim_ids = list(claim_ids)
+    ml = ml_scores(model, X)
+
+    n_modified = 0
+    for offset in range(0, len(claim_ids), chunk_size):
+        ids = claim_ids[offset:offset + chunk_size]
+        if rule_scores is None:
+            stored = {
+                doc["_id"]: doc.get("rule_score", 0)
+                for doc in collection.find({"_id": {"$in": ids}}, {"rule_score": 1})
+            }
+            rule = [stored.get(i, 0) for i in ids]
+        else:
+            rule = np.asarray(rule_scores)[offset:offset + chunk_size]
+        chunk_ml = ml[offset:offset + chunk_size]
+        fraud = hybrid_scores(rule, chunk_ml)
+
+        fields = [{"ml_score": int(m), "fraud_score": int(f)} for m, f in zip(chunk_ml, fraud)]
+        if rule_scores is not None:
+            for field, r in zip(fields, rule):
+                field["rule_score"] = int(r)
+
+        result = collection.bulk_write([
+            UpdateOne({"_id": i}, {"$set": field}) for i, field in zip(ids, fields)
+        ], ordered=False)
+        n_modified += result.modified_count
+
+        if verbose:
+            done = offset + len(ids)
+            rate = done / max(time.perf_counter() - start, 1e-9)
+            print(f"Rescored {done}/{len(claim_ids)} claims ({rate:,.0f} claims/s)")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "n_claims": len(claim_ids),
+        "n_modified": n_modified,
+        "seconds": round(elapsed, 3),
+        "claims_per_sec": round(len(claim_ids) / max(elapsed, 1e-9), 1),
+    }
@@ -0,0 +1,307 @@
+"""
+Asynchronous claim scoring.
+
+Submitted claims are inserted with scoring_status "pending"; the claims
+collection itself is the queue. Background workers lease a batch of pending
+claims, build their features in bulk, score the whole batch with the rule
+engine and one Isolation Forest predict call, and write the scores back.
+The app only inserts the claim and polls get_scoring_result for the score.
+
+    python -m utils.scoring_queue           # run a standalone worker
+    python -m utils.scoring_queue --once    # score all pending claims and exit
+"""
+
+import os
+import time
+import logging
+import uuid
+import datetime
+import threading
+import argparse
+import joblib
+from db.mongo import claims_col
+from utils.features import FEATURE_COLUMNS, build_feature_frame
+from utils.reference_cache import ReferenceCache
+from utils.rules import DEFAULT_RULES, evaluate_rules, with_risky_shops
+from utils.scoring import ml_scores, hybrid_scores, bulk_set_fields
+
+MODEL_PATH = "models/fraud_model.pkl"
+BATCH_SIZE = 256
+POLL_INTERVAL = 1.0
+LEASE_TIMEOUT = 60  # seconds before a claim leased by a dead worker is requeued
+MAX_ATTEMPTS = 3  # leases per claim before it is marked failed
+
+PENDING = "pending"
+SCORING = "scoring"
+SCORED = "scored"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_claim(claim_doc, collection=None):
+    """
+    Inserts a claim marked for background scoring (the only write on submit)
+    """
+    collection = claims_col if collection is None else collection
+    collection.insert_one({**claim_doc, "scoring_status": PENDING, "ingested_at": datetime.datetime.now()})
+
+
+def lease_batch(batch_size=BATCH_SIZE, collection=None):
+    """
+    Marks up to batch_size pending claims (oldest first) as being scored under a
+    fresh lease token and counts the attempt. Concurrent workers may pick the same
+    candidates; the conditional update_many gives each claim to exactly one of them.
+    Returns: (lease token, leased claim ids)
+    """
+    collection = claims_col if collection is None else collection
+    candidates = [
+        doc["_id"] for doc in
+        collection.find({"scoring_status": PENDING}, {"_id": 1}).sort("ingested_at", 1).limit(batch_size)
+    ]
+    if not candidates:
+        return None, []
+
+    token = uuid.uuid4().hex
+    collection.update_many(
+        {"_id": {"$in": candidates}, "scoring_status": PENDING},
+        {"$set": {"scoring_status": SCORING, "scoring_lease": token,
+                  "scoring_started_at": datetime.datetime.now()},
+         "$inc": {"scoring_attempts": 1}}
+    )
+    leased = [doc["_id"] for doc in collection.find({"_id": {"$in": candidates}, "scoring_lease": token}, {"_id": 1})]
+    return token, leased
+
+
+def _release(query, error, max_attempts, collection):
+    """
+    Leased claims matching query go back to the queue, or to failed once they
+    have used max_attempts leases
+    Returns: (number requeued, number failed)
+    """
+    fields = {} if error is None else {"scoring_error": error}
+    failed = collection.update_many(
+        {**query, "scoring_attempts": {"$gte": max_attempts}},
+        {"$set": {"scoring_status": FAILED, **fields}, "$unset": {"scoring_lease": ""}}
+    ).modified_count
+    requeued = collection.update_many(
+        query,
+        {"$set": {"scoring_status": PENDING, **fields}, "$unset": {"scoring_lease": ""}}
+    ).modified_count
+    return requeued, failed
+
+
+def release_claims(token, claim_ids, error, max_attempts=MAX_ATTEMPTS, collection=None):
+    """
+    Gives up this lease on claims whose scoring raised
+    Returns: (number requeued, number failed)
+    """
+    collection = claims_col if collection is None else collection
+    return _release({"_id": {"$in": list(claim_ids)}, "scoring_lease": token}, error, max_attempts, collection)
+
+
+def requeue_stale(timeout=LEASE_TIMEOUT, max_attempts=MAX_ATTEMPTS, collection=None):
+    """
+    Returns claims leased more than timeout seconds ago (by a worker that died)
+    to the queue
+    Returns: (number requeued, number failed)
+    """
+    collection = claims_col if collection is None else collection
+    cutoff = datetime.datetime.now() - datetime.timedelta(seconds=timeout)
+    return _release({"scoring_status": SCORING, "scoring_started_at": {"$lt": cutoff}},
+                    "lease expired", max_attempts, collection)
+
+
+def score_batch(model, token, claim_ids, risky_shops, collection=None):
+    """
+    Scores a leased batch: features in bulk, rule scores in one pass and a single
+    predict call for the ML scores. Claims without a policy or vehicle are marked failed.
+    Returns: number of scored claims
+    """
+    collection = claims_col if collection is None else collection
+    features = build_feature_frame({"_id": {"$in": list(claim_ids)}}, risky_shops)
+    rule, _ = evaluate_rules(features, with_risky_shops(DEFAULT_RULES, risky_shops))
+    ml = ml_scores(model, features[FEATURE_COLUMNS].to_numpy(dtype=float))
+
+    scored = list(features.index)
+    bulk_set_fields(scored, {
+        "rule_score": rule,
+        "ml_score": ml,
+        "fraud_score": hybrid_scores(rule, ml)
+    }, collection, verbose=False)
+
+    now = datetime.datetime.now()
+    collection.update_many(
+        {"_id": {"$in": scored}, "scoring_lease": token},
+        {"$set": {"scoring_status": SCORED, "scored_at": now}, "$unset": {"scoring_lease": "", "scoring_error": ""}}
+    )
+    failed = sorted(set(claim_ids) - set(scored))
+    if failed:
+        collection.update_many(
+            {"_id": {"$in": failed}, "scoring_lease": token},
+            {"$set": {"scoring_status": FAILED, "scored_at": now, "scoring_error": "missing policy or vehicle"},
+             "$unset": {"scoring_lease": ""}}
+        )
+    return len(scored)
+
+
+def get_scoring_result(claim_id, collection=None):
+    """
+    Scoring status and scores of one claim (polled by the app after submit), or None
+    """
+    collection = claims_col if collection is None else collection
+    return collection.find_one({"_id": claim_id}, {
+        "scoring_status": 1, "scoring_error": 1, "rule_score": 1, "ml_score": 1, "fraud_score": 1
+    })
+
+
+class ScoringWorker:
+    """
+    Pool of background threads draining the scoring queue. Each thread leases a
+    batch, scores it and immediately leases the next one while claims are
+    pending, so batches grow with load; when the queue is empty it sleeps until
+    notify() or poll_interval. The model is reloaded when its file changes.
+    If a batch raises, its claims are retried one by one so only the offending
+    claims use up an attempt; after max_attempts a claim is marked failed.
+    """
+
+    def __init__(self, model_path=MODEL_PATH, reference=None, num_threads=1,
+                 batch_size=BATCH_SIZE, poll_interval=POLL_INTERVAL, lease_timeout=LEASE_TIMEOUT,
+                 max_attempts=MAX_ATTEMPTS):
+        self.model_path = model_path
+        self.reference = reference or ReferenceCache()
+        self.num_threads = num_threads
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+
+        self._model = None
+        self._model_mtime = None
+        self._model_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self.n_batches = 0
+        self.n_scored = 0
+        self.n_errors = 0
+
+    def _get_model(self):
+        with self._model_lock:
+            mtime = os.path.getmtime(self.model_path)
+            if mtime != self._model_mtime:
+                self._model = joblib.load(self.model_path)
+                self._model_mtime = mtime
+            return self._model
+
+    def run_once(self):
+        """
+        Leases and scores one batch
+        Returns: number of claims leased (0 when the queue is empty)
+        """
+        # Load the model before leasing: a missing model file must not use up attempts
+        model = self._get_model()
+        token, claim_ids = lease_batch(self.batch_size)
+        if not claim_ids:
+            return 0
+        risky_shops = self.reference.risky_shops()
+
+        n_scored, n_errors = 0, 0
+        try:
+            n_scored = score_batch(model, token, claim_ids, risky_shops)
+        except Exception as e:
+            if len(claim_ids) == 1:
+                n_errors = self._give_up(token, claim_ids[0], e)
+            else:
+                logger.warning("Batch of %d claims failed (%r), scoring them one by one", len(claim_ids), e)
+                for claim_id in claim_ids:
+                    try:
+                        n_scored += score_batch(model, token, [claim_id], risky_shops)
+                    except Exception as claim_error:
+                        n_errors += self._give_up(token, claim_id, claim_error)
+
+        with self._stats_lock:
+            self.n_batches += 1
+            self.n_scored += n_scored
+            self.n_errors += n_errors
+        return len(claim_ids)
+
+    def _give_up(self, token, claim_id, error):
+        logger.error("Scoring claim %s failed", claim_id, exc_info=error)
+        release_claims(token, [claim_id], repr(error), self.max_attempts)
+        return 1
+
+    def drain(self):
+        """
+        Scores batches until the queue is empty
+        Returns: number of claims leased
+        """
+        total = 0
+        while True:
+            n = self.run_once()
+            if n == 0:
+                return total
+            total += n
+
+    def _run(self):
+        last_requeue = 0.0
+        while not self._stop.is_set():
+            try:
+                if time.monotonic() - last_requeue > self.lease_timeout:
+                    requeue_stale(self.lease_timeout, self.max_attempts)
+                    last_requeue = time.monotonic()
+                self.drain()
+            except Exception:
+                # e.g. database or model file unavailable; keep the worker alive
+                logger.exception("Scoring worker error")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def start(self):
+        for i in range(self.num_threads):
+            thread = threading.Thread(target=self._run, name=f"scoring-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def notify(self):
+        """
+        Wakes idle threads right after a claim was enqueued
+        """
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def stats(self):
+        return {"batches": self.n_batches, "scored": self.n_scored, "errors": self.n_errors,
+                "avg_batch": round(self.n_scored / max(self.n_batches, 1), 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score pending claims in the background")
+    parser.add_argument("--once", action="store_true", help="Score all pending claims and exit")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="[ %(asctime)s ] %(levelname)s %(message)s")
+
+    worker = ScoringWorker(num_threads=args.threads, batch_size=args.batch_size)
+    if args.once:
+        requeue_stale()
+        n = worker.drain()
+        logger.info("Processed %d pending claims (%s)", n, worker.stats())
+    else:
+        worker.start()
+        logger.info("Scoring worker running, Ctrl+C to stop")
+        try:
+            while True:
+                time.sleep(60)
+                logger.info("Scoring worker: %s", worker.stats())
+        except KeyboardInterrupt:
+            worker.stop()
@@ -0,0 +1,209 @@
+"""
+Repair-shop collusion graph.
+
+Claims link policyholders and vehicles to the repair shop on their repair
+estimate, giving a bipartite entity/shop graph. One edge document per claim
+(claim, shop, policyholder, vehicle) is kept in the shop_graph_edges collection
+and updated incrementally from claim_events by their ingested_at; shop risk is computed from the
+edges and the claims' current scores with sparse-matrix operations and published
+to reference_data, where the app's ReferenceCache serves the risky-shop list.
+"""
+
+import sys
+import datetime
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from pymongo import UpdateOne
+from db.mongo import claims_col, policies_col, events_col, shop_edges_col, reference_col
+from utils.features import find_frame
+from utils.reference_cache import load_risky_shops, set_risky_shops, SHOP_RISK_ID
+from utils.rules import DEFAULT_RULES
+
+GRAPH_STATE_ID = "shop_graph_state"
+HIGH_SCORE = 60
+# Events ingested in the last seconds before a run are left for the next one,
+# so inserts still in flight (or from a slightly skewed clock) are not skipped
+INGEST_GRACE_SECONDS = 60
+
+
+def _claim_edges(events):
+    """
+    Policyholder and vehicle of each claim in a batch of repair events
+    """
+    claims = find_frame(claims_col, {}, {"_id": 1, "policy_id": 1},
+                        "_id", events["claim_id"].unique()).rename(columns={"_id": "claim_id"})
+    policies = find_frame(policies_col, {}, {"_id": 1, "policyholder_id": 1, "vehicle_id": 1},
+                          "_id", claims["policy_id"].unique()).rename(columns={"_id": "policy_id"})
+    return events.merge(claims, on="claim_id").merge(policies, on="policy_id")
+
+
+def update_shop_graph(batch_size=50_000, grace_seconds=INGEST_GRACE_SECONDS):
+    """
+    Adds repair estimates ingested since the last run as per-claim edge documents.
+    Events are selected by ingested_at (insertion time) up to a cutoff grace_seconds
+    in the past, not by ObjectId: ObjectIds are generated by the clients and are not
+    ordered across writers. The upserts are keyed by claim, so replaying a window
+    after a crash before its checkpoint was saved changes nothing.
+    Returns: number of events processed
+    """
+    state = reference_col.find_one({"_id": GRAPH_STATE_ID}) or {}
+    ingested_until = state.get("ingested_until")
+    cutoff = datetime.datetime.now() - datetime.timedelta(seconds=grace_seconds)
+
+    query = {"event_type": "repair_estimate_added"}
+    if ingested_until is None:
+        # First run or rebuild: also events stored before ingested_at existed
+        query["ingested_at"] = {"$not": {"$gt": cutoff}}
+    else:
+        query["ingested_at"] = {"$gt": ingested_until, "$lte": cutoff}
+
+    last_id, n_events = None, 0
+    while True:
+        # The window is fixed for this run, so paging through it by _id is safe
+        page_query = query if last_id is None else {**query, "_id": {"$gt": last_id}}
+        docs = list(events_col.find(page_query, {"claim_id": 1, "metadata.repair_shop": 1})
+                    .sort("_id", 1).limit(batch_size))
+        if not docs:
+            break
+
+        events = pd.DataFrame({
+            "claim_id": [d["claim_id"] for d in docs],
+            "repair_shop": [(d.get("metadata") or {}).get("repair_shop") for d in docs],
+        }).dropna(subset=["repair_shop"])
+
+        edges = _claim_edges(events) if not events.empty else pd.DataFrame()
+        if not edges.empty:
+            # $setOnInsert: the first repair estimate of a claim wins, like the ML features
+            shop_edges_col.bulk_write([
+                UpdateOne(
+                    {"_id": row.claim_id},
+                    {"$setOnInsert": {"shop": row.repair_shop, "policyholder_id": row.policyholder_id,
+                                      "vehicle_id": row.vehicle_id}},
+                    upsert=True
+                )
+                for row in edges.itertuples()
+            ], ordered=False)
+
+        last_id = docs[-1]["_id"]
+        n_events += len(docs)
+
+    reference_col.update_one({"_id": GRAPH_STATE_ID}, {"$set": {"ingested_until": cutoff}}, upsert=True)
+    return n_events
+
+
+def rebuild_shop_graph():
+    """
+    Drops all edges and the checkpoint, then rebuilds from every repair event
+    """
+    shop_edges_col.delete_many({})
+    reference_col.delete_one({"_id": GRAPH_STATE_ID})
+    return update_shop_graph()
+
+
+def high_score_claims(edges, risky_shops, rules=DEFAULT_RULES):
+    """
+    Whether each edge's claim is a high-score claim by its current scores, not
+    counting the risky-repair-shop rule: that rule's weight was added for shops
+    already on the list and would keep them listed
+    """
+    claims = find_frame(claims_col, {}, {"_id": 1, "rule_score": 1, "ml_score": 1},
+                        "_id", edges["claim_id"]).set_index("_id")
+    scores = claims.reindex(edges["claim_id"]).fillna(0)
+
+    shop_weight = sum(rule["weight"] for rule in rules if rule["feature"] == "repair_shop")
+    shop_points = np.where(edges["shop"].isin(risky_shops), shop_weight, 0)
+    score = np.maximum(scores["rule_score"].to_numpy() - shop_points, 0) + scores["ml_score"].to_numpy()
+    return (score >= HIGH_SCORE).astype(int)
+
+
+def compute_shop_risk(min_claims=5, min_lift=1.5):
+    """
+    Shop-level risk from the edges and the claims' current scores:
+    - high_score_rate: share of the shop's claims that are high-score claims
+      (see high_score_claims)
+    - lift: high_score_rate relative to the rate over all shops
+    - shared_shops: other shops sharing at least one policyholder/vehicle (B^T B)
+    - component_shops / component_entities: size of the shop's connected component
+    A shop is risky when it has at least min_claims claims and lift >= min_lift.
+    Returns: DataFrame indexed by shop
+    """
+    edges = pd.DataFrame(list(shop_edges_col.find({}, {"shop": 1, "policyholder_id": 1, "vehicle_id": 1})),
+                         columns=["_id", "shop", "policyholder_id", "vehicle_id"])
+    if edges.empty:
+        return pd.DataFrame(columns=["claims", "high_score_rate", "lift", "shared_shops", "component_shops",
+                                     "component_entities", "risky"])
+    edges = edges.rename(columns={"_id": "claim_id"})
+    high_claims = high_score_claims(edges, load_risky_shops())
+
+    # Policyholders and vehicles share one node namespace ("PH:..." / "VH:...");
+    # a claim whose policy has no policyholder or vehicle link gets no edge for it
+    shop_codes, shops = pd.factorize(edges["shop"])
+    has_ph = edges["policyholder_id"].notna().to_numpy()
+    has_vh = edges["vehicle_id"].notna().to_numpy()
+    entity_codes, entities = pd.factorize(pd.concat([
+        "PH:" + edges.loc[has_ph, "policyholder_id"].astype(str),
+        "VH:" + edges.loc[has_vh, "vehicle_id"].astype(str)
+    ], ignore_index=True))
+    link_shops = np.concatenate([shop_codes[has_ph], shop_codes[has_vh]])
+    shape = (len(entities), len(shops))
+
+    # Entity x shop incidence matrix (claim links; duplicates are summed)
+    B = sparse.csr_matrix((np.ones(len(entity_codes)), (entity_codes, link_shops)), shape=shape)
+
+    claims = np.bincount(shop_codes, minlength=len(shops))
+    high = np.bincount(shop_codes, weights=high_claims, minlength=len(shops))
+
+    # Shop-shop co-occurrence through shared policyholders/vehicles
+    linked = (B > 0).astype(np.int32)
+    co_occurrence = (linked.T @ linked).tocsr()
+    co_occurrence.setdiag(0)
+    co_occurrence.eliminate_zeros()
+    shared_shops = np.diff(co_occurrence.indptr)
+
+    # Connected components of the bipartite graph (entities first, then shops)
+    adjacency = sparse.bmat([[None, linked], [linked.T, None]], format="csr")
+    _, labels = connected_components(adjacency, directed=False)
+    entity_labels, shop_labels = labels[:len(entities)], labels[len(entities):]
+    component_shops = np.bincount(shop_labels, minlength=labels.max() + 1)[shop_labels]
+    component_entities = np.bincount(entity_labels, minlength=labels.max() + 1)[shop_labels]
+
+    high_score_rate = np.divide(high, claims, out=np.zeros(len(shops)), where=claims > 0)
+    overall_rate = high.sum() / max(claims.sum(), 1)
+
+    risk = pd.DataFrame({
+        "claims": claims,
+        "high_score_rate": high_score_rate,
+        "lift": high_score_rate / overall_rate if overall_rate > 0 else np.zeros(len(shops)),
+        "shared_shops": shared_shops,
+        "component_shops": component_shops,
+        "component_entities": component_entities,
+    }, index=pd.Index(shops, name="shop"))
+    risk["risky"] = (risk["claims"] >= min_claims) & (risk["lift"] >= min_lift)
+    return risk.sort_values("high_score_rate", ascending=False)
+
+
+def publish_shop_risk(risk):
+    """
+    Stores per-shop risk (for inspection) and the derived risky-shop list in
+    reference_data; set_risky_shops bumps the version so ReferenceCache reloads the list
+    """
+    # A list rather than a dict keyed by shop: shop names may contain "." or "$"
+    shops = [
+        {"shop": shop, **{key: (bool(value) if key == "risky" else float(value)) for key, value in row.items()}}
+        for shop, row in risk.to_dict(orient="index").items()
+    ]
+    reference_col.update_one({"_id": SHOP_RISK_ID}, {"$set": {
+        "shops": shops,
+        "updated_at": datetime.datetime.now()
+    }}, upsert=True)
+    set_risky_shops(risk.index[risk["risky"]].tolist())
+
+
+if __name__ == "__main__":
+    n_events = rebuild_shop_graph() if "--rebuild" in sys.argv else update_shop_graph()
+    print(f"Added {n_events} repair events to the shop graph")
+    risk = compute_shop_risk()
+    publish_shop_risk(risk)
+    print(risk.to_string())